@@ -0,0 +1,210 @@
+"""
+Local index of launchable applications for OpenApp / CloseApp.
+
+    app = app_resolver.resolve("vs code")   # fuzzy, no subprocess, no network
+    app.launch_command                     # ['/usr/share/code/code', '--unity-launch']
+    app.process_name                       # 'code', for an exact pkill
+
+The index only covers .desktop entries (Linux) and .app bundles (macOS).
+PATH binaries are never indexed: a misheard "shut down" or "settings" must
+not fuzzy-match /usr/sbin/shutdown or gsettings. The index is built on first use (or in the background by warm()) and
+refreshed incrementally: only directories whose mtime changed are rescanned,
+at most every REFRESH_INTERVAL seconds. Web fallbacks for names that are not
+installed ("open facebook") are cached on disk so a repeat open needs no
+Google scrape.
+"""
+
+import os
+import re
+import time
+import shlex
+import difflib
+import platform
+import threading
+from Backend.Cache import TTLCache, CACHE_DB_PATH
+
+REFRESH_INTERVAL = 30  # seconds between mtime checks
+MATCH_CUTOFF = 0.75
+WEB_LINK_TTL = 30 * 24 * 3600
+
+DESKTOP_DIRS = [
+    "/usr/share/applications",
+    "/usr/local/share/applications",
+    os.path.expanduser("~/.local/share/applications"),
+    "/var/lib/flatpak/exports/share/applications",
+    "/var/lib/snapd/desktop/applications",
+]
+BUNDLE_DIRS = ["/Applications", "/System/Applications", os.path.expanduser("~/Applications")]
+EXEC_FIELD_CODES = re.compile(r"%[fFuUdDnNickvm]")
+# launchers that start the real app; pkill -x on these would hit unrelated processes
+WRAPPER_EXECUTABLES = {"sh", "bash", "dash", "zsh", "env", "flatpak", "snap", "gtk-launch", "xdg-open", "exo-open"}
+
+
+def NormaliseAppName(name: str) -> str:
+    name = name.lower().replace(".app", "").replace(".desktop", "")
+    return " ".join(re.sub(r"[^a-z0-9+]+", " ", name).split())
+
+
+class AppEntry:
+    def __init__(self, name, kind, launch_command, process_name, source):
+        self.name = name
+        self.kind = kind  # desktop / bundle
+        self.launch_command = launch_command
+        self.process_name = process_name  # None when only a wrapper (sh -c, flatpak run) is known
+        self.source = source  # file the entry came from
+
+    def __repr__(self):
+        return f"AppEntry({self.name!r}, {self.kind})"
+
+
+def _parse_desktop_file(path):
+    fields = {}
+    in_entry = False
+    try:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("["):
+                    in_entry = line == "[Desktop Entry]"
+                elif in_entry and "=" in line:
+                    key, _, value = line.partition("=")
+                    fields.setdefault(key.strip(), value.strip())
+    except OSError:
+        return []
+    if fields.get("Type", "Application") != "Application" or fields.get("Hidden") == "true" or not fields.get("Exec"):
+        return []
+    try:
+        command = shlex.split(EXEC_FIELD_CODES.sub("", fields["Exec"]))
+    except ValueError:
+        return []
+    if not command:
+        return []
+    process_name = _process_name(fields, command)
+    names = {fields.get("Name", ""), os.path.basename(path)[:-len(".desktop")], process_name or ""}
+    return [AppEntry(name, "desktop", command, process_name, path) for name in names if name]
+
+
+def _process_name(fields, command):
+    """Name to pkill -x for a .desktop entry: TryExec, StartupWMClass, then Exec, never a wrapper."""
+    for candidate in (fields.get("TryExec"), fields.get("StartupWMClass"), command[0]):
+        name = os.path.basename(candidate or "")
+        if name and name not in WRAPPER_EXECUTABLES:
+            return name
+    return None
+
+
+def _scan_desktop_dir(directory):
+    entries = []
+    for filename in os.listdir(directory):
+        if filename.endswith(".desktop"):
+            entries += _parse_desktop_file(os.path.join(directory, filename))
+    return entries
+
+
+def _scan_bundle_dir(directory):
+    entries = []
+    for filename in os.listdir(directory):
+        if filename.endswith(".app"):
+            name = filename[:-len(".app")]
+            entries.append(AppEntry(name, "bundle", ["open", "-a", os.path.join(directory, filename)], name,
+                                    os.path.join(directory, filename)))
+    return entries
+
+
+class AppResolver:
+    def __init__(self, refresh_interval=REFRESH_INTERVAL, cache_path=CACHE_DB_PATH):
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._dirs = {}  # directory -> (mtime, [AppEntry])
+        self._index = {}  # normalised name -> AppEntry
+        self._checked_at = 0.0
+        self.web_links = TTLCache(maxsize=256, ttl=WEB_LINK_TTL, path=cache_path, namespace="app_links")
+
+    def _sources(self):
+        system = platform.system()
+        if system == "Linux":
+            return [(d, _scan_desktop_dir) for d in DESKTOP_DIRS]
+        if system == "Darwin":
+            return [(d, _scan_bundle_dir) for d in BUNDLE_DIRS]
+        return []
+
+    def refresh(self, force=False):
+        """Rescan directories whose mtime changed since the last scan."""
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._index and now - self._checked_at < self.refresh_interval:
+                return
+            self._checked_at = now
+            changed = False
+            for directory, scan in self._sources():
+                try:
+                    mtime = os.stat(directory).st_mtime
+                except OSError:
+                    changed |= self._dirs.pop(directory, None) is not None
+                    continue
+                known = self._dirs.get(directory)
+                if known is not None and known[0] == mtime:
+                    continue
+                try:
+                    self._dirs[directory] = (mtime, scan(directory))
+                except OSError:
+                    continue
+                changed = True
+            if changed or not self._index:
+                self._rebuild()
+
+    def _rebuild(self):
+        # earlier directories win
+        index = {}
+        for _, entries in reversed(list(self._dirs.values())):
+            for entry in entries:
+                index[NormaliseAppName(entry.name)] = entry
+        self._index = index
+
+    def warm(self):
+        """Build the index in a background thread."""
+        threading.Thread(target=self.refresh, daemon=True).start()
+
+    def resolve(self, name):
+        """Best local match for name, or None."""
+        self.refresh()
+        key = NormaliseAppName(name)
+        with self._lock:
+            if key in self._index:
+                return self._index[key]
+            candidates = difflib.get_close_matches(key, self._index.keys(), n=1, cutoff=MATCH_CUTOFF)
+            if candidates:
+                return self._index[candidates[0]]
+            # "code" -> "visual studio code"
+            for indexed, entry in self._index.items():
+                if len(key) >= 4 and indexed.endswith(" " + key):
+                    return entry
+        return None
+
+    def web_link(self, name, finder):
+        """Cached finder(name) result; None results are not cached."""
+        key = NormaliseAppName(name)
+        link = self.web_links.get(key)
+        if link is None:
+            link = finder(name)
+            if link:
+                self.web_links.set(key, link)
+        return link
+
+    def __len__(self):
+        return len(self._index)
+
+
+app_resolver = AppResolver()
+
+
+if __name__ == "__main__":
+    import sys
+    start = time.perf_counter()
+    app_resolver.refresh()
+    print(f"Indexed {len(app_resolver)} names in {(time.perf_counter() - start) * 1000:.0f} ms")
+    start = time.perf_counter()
+    app_resolver.refresh(force=True)
+    print(f"Incremental refresh (nothing changed): {(time.perf_counter() - start) * 1000:.1f} ms")
+    for name in sys.argv[1:] or ["firefox", "text editor", "shut down"]:
+        print(f"{name!r} -> {app_resolver.resolve(name)}")
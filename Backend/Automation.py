@@ -1,15 +1,14 @@
 import os
 import asyncio
 import subprocess
-import requests
-import keyboard
 import webbrowser
 import platform
-from dotenv import dotenv_values
-from bs4 import BeautifulSoup
-from pywhatkit import search, playonyt
 from rich import print
-import google.generativeai as genai
+from Backend.Retry import stream_with_retry
+from Backend.HTTP import get_http_client
+from Backend.Commands import registry, executor
+from Backend.AppResolver import app_resolver, NormaliseAppName, WRAPPER_EXECUTABLES
+from Backend.Config import get_config, gemini_model
 
 # Platform-specific app handling
 if platform.system() == "Windows":
@@ -21,21 +20,16 @@ if platform.system() == "Windows":
 else:
     USE_APPOPENER = False
 
-# Load API key
-env_vars = dotenv_values(".env")
-GeminiAPIKey = env_vars.get("GeminiAPIKey")
-
-# Initialize Gemini client
-genai.configure(api_key=GeminiAPIKey)
-model = genai.GenerativeModel('gemini-pro')
-
 # System chat starter
 messages = []
 SystemChatBot = [{
     "role": "system",
-    "content": f"Hello, I am {os.environ.get('Username', 'User')}, You're a content writer. You have to write content like a letter."
+    "content": f"Hello, I am {get_config().username}, You're a content writer. You have to write content like a letter."
 }]
 
+# Launchers that hang should not hold an automation worker forever
+SUBPROCESS_TIMEOUT = 10
+
 # User-agent for web scraping
 useragent = (
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
@@ -47,7 +41,11 @@ useragent = (
 # Functional Actions
 # -------------------------------
 
+# pywhatkit, keyboard and bs4 are imported by the commands that use them;
+# pywhatkit checks the internet connection as soon as it is imported
+
 def GoogleSearch(topic: str) -> bool:
+    from pywhatkit import search
     search(topic)
     return True
 
@@ -57,6 +55,7 @@ def YouTubeSearch(topic: str) -> bool:
     return True
 
 def PlayYoutube(query: str) -> bool:
+    from pywhatkit import playonyt
     playonyt(query)
     return True
 
@@ -66,8 +65,10 @@ def OpenNotepad(file_path: str):
     except Exception as e:
         print(f"[red]Failed to open Notepad:[/red] {e}")
 
-def ContentWriterAI(prompt: str) -> str:
+def ContentWriterAIStream(prompt: str):
+    """Yield the written content chunk by chunk as Gemini produces it."""
     messages.append({"role": "user", "content": prompt})
+    answer = ""
     try:
         # Build conversation for Gemini
         conversation_text = SystemChatBot[0]["content"] + "\n\n"
@@ -76,78 +77,92 @@ def ContentWriterAI(prompt: str) -> str:
             conversation_text += f"{role}: {msg['content']}\n"
         
         # Generate response with Gemini
-        response = model.generate_content(
-            conversation_text,
-            generation_config=genai.types.GenerationConfig(
-                max_output_tokens=2048,
-                temperature=0.7,
-            ),
-            stream=True
-        )
-
-        answer = ""
-        for chunk in response:
-            if chunk.text:
-                print(chunk.text, end="", flush=True)
-                answer += chunk.text
-
-        messages.append({"role": "assistant", "content": answer})
-        return answer
+        def open_stream():
+            response = gemini_model().generate_content(
+                conversation_text,
+                generation_config={"max_output_tokens": 2048, "temperature": 0.7},
+                stream=True
+            )
+            return (chunk.text for chunk in response if chunk.text)
+
+        for chunk in stream_with_retry("gemini", open_stream):
+            answer += chunk
+            yield chunk
     except Exception as e:
         print(f"[red]Error using Gemini API:[/red] {e}")
-        return "Error generating content."
+        if not answer:
+            messages.pop()  # forget the unanswered prompt
+            yield "Error generating content."
+            return
+    messages.append({"role": "assistant", "content": answer})
+
+def ContentWriterAI(prompt: str) -> str:
+    return "".join(ContentWriterAIStream(prompt))
 
 def Content(topic: str) -> bool:
-    topic_clean = topic.strip().replace("content ", "")
-    result = ContentWriterAI(topic_clean)
+    topic_clean = topic.strip()
     # Cross-platform path handling
     file_name = os.path.join("Data", f"{topic_clean.lower().replace(' ', '')}.txt")
 
     os.makedirs("Data", exist_ok=True)
+    # content file mai aate hi likha jata hai, puri generation ka wait nahi
     with open(file_name, "w", encoding="utf-8") as file:
-        file.write(result)
+        for chunk in ContentWriterAIStream(topic_clean):
+            file.write(chunk)
+            file.flush()
 
     OpenNotepad(file_name)
     return True
 
-def OpenApp(app_name: str, session=requests.session()) -> bool:
+def FindWebLink(app_name: str):
+    """First link of a Google search for app_name (cached by the app resolver)."""
+    from bs4 import BeautifulSoup
+    headers = {"User-Agent": useragent}
+    response = get_http_client().get("https://www.google.com/search", params={"q": app_name}, headers=headers)
+    if response.status_code != 200:
+        return None
+    soup = BeautifulSoup(response.text, 'html.parser')
+    links = [link.get('href') for link in soup.find_all('a', href=True)]
+    return "https://www.google.com" + links[0] if links else None
+
+def OpenApp(app_name: str) -> bool:
     try:
         if USE_APPOPENER:
             appopen(app_name, match_closest=True, output=True, throw_error=True)
-        elif platform.system() == "Darwin":  # macOS
-            subprocess.run(['open', '-a', app_name], check=True, capture_output=True)
-        else:  # Linux or other
-            subprocess.run(['xdg-open', app_name], check=True, capture_output=True)
-        return True
+            return True
+        # installed apps are looked up in the local index, no blind xdg-open / open -a
+        app = app_resolver.resolve(app_name)
+        if app is not None:
+            subprocess.Popen(app.launch_command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                             start_new_session=True)
+            return True
     except Exception:
-        print(f"[yellow]Local app not found. Attempting web search...[/yellow]")
-
-        def extract_links(html: str) -> list:
-            soup = BeautifulSoup(html, 'html.parser')
-            links = soup.find_all('a', href=True)
-            return [link.get('href') for link in links]
-
-        def search_google(query: str) -> str:
-            headers = {"User-Agent": useragent}
-            response = session.get(f"https://www.google.com/search?q={query}", headers=headers)
-            return response.text if response.status_code == 200 else None
-
-        html = search_google(app_name)
-        if html:
-            links = extract_links(html)
-            if links:
-                webbrowser.open("https://www.google.com" + links[0])
-        return True
+        pass
+
+    print(f"[yellow]Local app not found. Attempting web search...[/yellow]")
+    link = app_resolver.web_link(app_name, FindWebLink)
+    if link:
+        webbrowser.open(link)
+    return True
 
 def CloseApp(app_name: str) -> bool:
     try:
         if USE_APPOPENER:
             appclose(app_name, match_closest=True, output=True, throw_error=True)
-        elif platform.system() == "Darwin":  # macOS
+            return True
+        app = app_resolver.resolve(app_name)
+        if platform.system() == "Darwin":  # macOS
             # Use osascript to quit the app gracefully
-            subprocess.run(['osascript', '-e', f'quit app "{app_name}"'], check=True, capture_output=True)
-        else:  # Linux or other
-            subprocess.run(['pkill', '-f', app_name], check=True, capture_output=True)
+            name = app.name if app is not None else app_name
+            subprocess.run(['osascript', '-e', f'quit app "{name}"'], check=True, capture_output=True, timeout=SUBPROCESS_TIMEOUT)
+        elif app is not None:  # Linux or other: exact process name when we know it
+            if app.process_name is None:  # only a wrapper like sh or flatpak, nothing safe to pkill
+                return False
+            subprocess.run(['pkill', '-x', app.process_name[:15]], check=True, capture_output=True, timeout=SUBPROCESS_TIMEOUT)
+        elif NormaliseAppName(app_name) in WRAPPER_EXECUTABLES:
+            return False
+        else:
+            subprocess.run(['pkill', '-f', app_name], check=True, capture_output=True, timeout=SUBPROCESS_TIMEOUT)
         return True
     except Exception:
         return False
@@ -161,6 +176,7 @@ def System(command: str) -> bool:
     }
     action = volume_actions.get(command.lower())
     if action:
+        import keyboard
         keyboard.press_and_release(action)
         return True
     return False
@@ -169,36 +185,28 @@ def System(command: str) -> bool:
 # Command Dispatcher
 # -------------------------------
 
+registry.register("open", OpenApp, idempotent=True, description="Open an app, or its website if not installed")
+registry.register("close", CloseApp, idempotent=True, description="Close a running app")
+registry.register("play", PlayYoutube, description="Play a song on YouTube")
+registry.register("content", Content, description="Write content with Gemini and open it in Notepad", timeout=120)
+registry.register("google search", GoogleSearch, idempotent=True, description="Search Google in the browser")
+registry.register("youtube search", YouTubeSearch, idempotent=True, description="Search YouTube in the browser")
+registry.register("system", System, description="Volume and mute keys")
+registry.load_plugins()
+if not USE_APPOPENER:
+    app_resolver.warm()  # build the installed-app index in the background
+
+# har command ka result aate hi milta hai, sab ke khatam hone ka wait nahi
 async def TranslateAndExecute(commands: list[str]):
-    tasks = []
-
-    for command in commands:
-        cmd = command.lower().strip()
-
-        if cmd.startswith("open "):
-            tasks.append(asyncio.to_thread(OpenApp, cmd[5:]))
-        elif cmd.startswith("close "):
-            tasks.append(asyncio.to_thread(CloseApp, cmd[6:]))
-        elif cmd.startswith("play "):
-            tasks.append(asyncio.to_thread(PlayYoutube, cmd[5:]))
-        elif cmd.startswith("content "):
-            tasks.append(asyncio.to_thread(Content, cmd))
-        elif cmd.startswith("google search "):
-            tasks.append(asyncio.to_thread(GoogleSearch, cmd[14:]))
-        elif cmd.startswith("youtube search "):
-            tasks.append(asyncio.to_thread(YouTubeSearch, cmd[15:]))
-        elif cmd.startswith("system "):
-            tasks.append(asyncio.to_thread(System, cmd[7:]))
-        else:
-            print(f"[yellow]Unknown command:[/yellow] {command}")
-    
-    results = await asyncio.gather(*tasks)
-    for result in results:
+    async for result in executor.stream(commands):
         yield result
 
 async def Automation(commands: list[str]):
-    async for _ in TranslateAndExecute(commands):
-        pass
+    async for result in TranslateAndExecute(commands):
+        if result.ok:
+            print(f"[green]Done:[/green] {result.text} ({result.duration:.1f}s)")
+        else:
+            print(f"[red]{result.status.capitalize()}:[/red] {result.text} {result.error or ''}")
     return True
 
 # -------------------------------
@@ -0,0 +1,198 @@
+"""
+Small LRU + TTL cache with an optional SQLite tier.
+
+The in-memory tier is an OrderedDict bounded by maxsize; when a path is
+given, every entry is also written to a SQLite table so cached values
+survive restarts. Values must be JSON serialisable for the disk tier.
+Caches on the same file share one connection; expired rows are deleted when
+a cache opens and every PRUNE_EVERY writes, and each namespace keeps at most
+max_rows rows (the most recently stored).
+
+With stale_ttl > 0, get_or_load() serves an expired entry for up to
+stale_ttl more seconds while a background thread reloads it
+(stale-while-revalidate).
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+
+CACHE_DB_PATH = os.path.join("Data", "Cache.sqlite3")
+PRUNE_EVERY = 64  # writes between disk prunes
+
+_connections = {}  # absolute path -> (sqlite3.Connection, lock serialising its use)
+_connections_lock = threading.Lock()
+
+
+def _shared_connection(path):
+    key = os.path.abspath(path)
+    with _connections_lock:
+        if key not in _connections:
+            os.makedirs(os.path.dirname(key), exist_ok=True)
+            db = sqlite3.connect(key, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")  # commits stay cheap, readers never block
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "namespace TEXT, key TEXT, value TEXT, stored_at REAL, expires_at REAL, "
+                "PRIMARY KEY (namespace, key))"
+            )
+            db.commit()
+            _connections[key] = (db, threading.RLock())
+        return _connections[key]
+
+
+class TTLCache:
+    """LRU cache whose entries expire ttl seconds after they are stored."""
+
+    def __init__(self, maxsize=256, ttl=3600, path=None, namespace="default", stale_ttl=0, max_rows=None):
+        self.maxsize = maxsize
+        self.max_rows = max_rows or 8 * maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (stored_at, expires_at, value)
+        self._refreshing = set()  # keys being reloaded in the background
+        self._stats = {"hits": 0, "disk_hits": 0, "stale_hits": 0, "misses": 0,
+                       "evictions": 0, "refreshes": 0, "refresh_errors": 0}
+        self._db = None
+        self._writes = 0
+        if path:
+            self._db, self._db_lock = _shared_connection(path)
+            self._prune()
+
+    def _prune(self):
+        """Delete rows past their stale window, then the oldest rows over max_rows."""
+        with self._db_lock:
+            self._db.execute("DELETE FROM cache WHERE namespace = ? AND expires_at + ? <= ?",
+                             (self.namespace, self.stale_ttl, time.time()))
+            self._db.execute(
+                "DELETE FROM cache WHERE namespace = ? AND key NOT IN ("
+                "SELECT key FROM cache WHERE namespace = ? ORDER BY stored_at DESC LIMIT ?)",
+                (self.namespace, self.namespace, self.max_rows))
+            self._db.commit()
+
+    def _remember(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _load_from_disk(self, key):
+        if self._db is None:
+            return None
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT value, stored_at, expires_at FROM cache WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+        if row is None:
+            return None
+        value, stored_at, expires_at = row
+        return stored_at, expires_at, json.loads(value)
+
+    def _lookup(self, key, now):
+        """(entry, from_disk) for key; entries past their stale window are dropped."""
+        entry = self._entries.get(key)
+        from_disk = False
+        if entry is None:
+            entry = self._load_from_disk(key)
+            from_disk = entry is not None
+        if entry is not None and entry[1] + self.stale_ttl <= now:
+            self._delete(key)
+            entry = None
+        return entry, from_disk
+
+    def get(self, key, default=None):
+        now = time.time()
+        with self._lock:
+            entry, from_disk = self._lookup(key, now)
+            if entry is None or entry[1] <= now:
+                self._stats["misses"] += 1
+                return default
+            self._remember(key, entry)
+            self._stats["disk_hits" if from_disk else "hits"] += 1
+            return entry[2]
+
+    def get_or_load(self, key, loader, ttl=None):
+        """Return the cached value, calling loader() on a miss and caching its
+        result. A stale entry is returned at once and reloaded in the
+        background; if loader() raises, the stale value stays in place."""
+        now = time.time()
+        with self._lock:
+            entry, from_disk = self._lookup(key, now)
+            if entry is not None:
+                self._remember(key, entry)
+                if entry[1] > now:
+                    self._stats["disk_hits" if from_disk else "hits"] += 1
+                    return entry[2]
+                self._stats["stale_hits"] += 1
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    threading.Thread(target=self._refresh, args=(key, loader, ttl), daemon=True).start()
+                return entry[2]
+            self._stats["misses"] += 1
+        value = loader()
+        self.set(key, value, ttl)
+        return value
+
+    def _refresh(self, key, loader, ttl):
+        try:
+            value = loader()
+        except Exception as e:
+            with self._lock:
+                self._stats["refresh_errors"] += 1
+            print(f"[Cache] Background refresh of '{key}' failed: {e}")
+        else:
+            self.set(key, value, ttl)
+            with self._lock:
+                self._stats["refreshes"] += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def set(self, key, value, ttl=None):
+        now = time.time()
+        entry = (now, now + (self.ttl if ttl is None else ttl), value)
+        with self._lock:
+            self._remember(key, entry)
+            if self._db is not None:
+                with self._db_lock:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?)",
+                        (self.namespace, key, json.dumps(value), entry[0], entry[1]),
+                    )
+                    self._db.commit()
+                self._writes += 1
+                if self._writes % PRUNE_EVERY == 0:
+                    self._prune()
+
+    def _delete(self, key):
+        self._entries.pop(key, None)
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (self.namespace, key))
+                self._db.commit()
+
+    def delete(self, key):
+        with self._lock:
+            self._delete(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                with self._db_lock:
+                    self._db.execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+                    self._db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = sum(self._stats[name] for name in ("hits", "disk_hits", "stale_hits", "misses"))
+            hit_rate = (lookups - self._stats["misses"]) / lookups if lookups else 0.0
+            return dict(self._stats, size=len(self._entries), hit_rate=round(hit_rate, 3))
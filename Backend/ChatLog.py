@@ -0,0 +1,556 @@
+"""
+Append-only chat history store shared by the chatbot, the realtime search
+engine and the front ends.
+
+Messages are written as length-prefixed JSON records into numbered segment
+files under Data/ChatLog/. Every segment has a fixed-width offset index next
+to it, so appending a turn is O(1) and the last N turns can be read without
+touching the rest of the history.
+
+Appends from every caller (chatbot, realtime search, Streamlit sessions, the
+desktop GUI) go through one ChatLogWriter thread, which gathers whatever
+arrives within flush_interval into a group commit: one write and one flush
+(and fsync, in "fsync" mode) per store per batch. Readers first wait for the
+appends already queued for their store, so they always see their own writes.
+"""
+
+import os
+import json
+import time
+import queue
+import atexit
+import shutil
+import struct
+import threading
+from collections import deque
+from Backend.Config import get_config
+
+CHAT_LOG_DIR = os.path.join("Data", "ChatLog")
+LEGACY_CHAT_LOG_PATH = os.path.join("Data", "ChatLog.json")
+SEGMENT_MAX_BYTES = 4 * 1024 * 1024
+
+# record = 8 hex digit payload length + space + JSON payload + newline
+HEADER_SIZE = 9
+OFFSET = struct.Struct(">Q")
+
+# async: append() returns at once; commit: it waits for the group commit;
+# fsync: it waits until the batch is fsynced to disk
+DURABILITY_MODES = ("async", "commit", "fsync")
+FLUSH_INTERVAL = get_config().float("ChatLogFlushInterval", 0.01)  # seconds a batch stays open
+DURABILITY = get_config().get("ChatLogDurability", "async")
+
+
+def encode_record(message: dict) -> bytes:
+    payload = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    return b"%08x " % len(payload) + payload + b"\n"
+
+
+def decode_records(buffer: bytes, start: int = 0):
+    """Yield (offset, next_offset, message) for every complete record in buffer."""
+    position = start
+    while position + HEADER_SIZE <= len(buffer):
+        try:
+            length = int(buffer[position:position + HEADER_SIZE - 1], 16)
+        except ValueError:
+            return
+        end = position + HEADER_SIZE + length
+        if end >= len(buffer) or buffer[end:end + 1] != b"\n":
+            return
+        try:
+            message = json.loads(buffer[position + HEADER_SIZE:end].decode("utf-8"))
+        except ValueError:
+            return
+        yield position, end + 1, message
+        position = end + 1
+
+
+class ChatLogStore:
+    """Segmented, append-only chat log with an offset index per segment."""
+
+    def __init__(self, directory=CHAT_LOG_DIR, legacy_path=LEGACY_CHAT_LOG_PATH,
+                 segment_max_bytes=SEGMENT_MAX_BYTES, writer=None):
+        self.directory = directory
+        self.legacy_path = legacy_path
+        self.segment_max_bytes = segment_max_bytes
+        self.writer = writer  # None: append() writes in the caller's thread
+        self._pending = []  # Commit handles queued on the writer, not yet written
+        self._pending_lock = threading.Lock()
+        self._lock = threading.RLock()
+        self._segments = []  # segment numbers, oldest first
+        self._counts = {}  # segment number -> record count
+        self._segment_file = None
+        self._index_file = None
+        self._segment_size = 0
+        self.generation = 0  # bumped whenever existing records are rewritten
+
+        self._finish_interrupted_compaction()
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+        if not self._segments and legacy_path and os.path.exists(legacy_path):
+            self._migrate_legacy()
+
+    # ---------- paths ----------
+
+    def _segment_path(self, number):
+        return os.path.join(self.directory, f"segment-{number:06d}.log")
+
+    def _index_path(self, number):
+        return os.path.join(self.directory, f"segment-{number:06d}.idx")
+
+    # ---------- opening and recovery ----------
+
+    def _finish_interrupted_compaction(self):
+        staging = self.directory + ".compact"
+        retired = self.directory + ".old"
+        if os.path.isdir(retired):
+            if os.path.isdir(self.directory):
+                shutil.rmtree(retired)
+            else:
+                os.rename(retired, self.directory)
+        if os.path.isdir(staging):
+            shutil.rmtree(staging)
+
+    def _load(self):
+        numbers = []
+        for name in os.listdir(self.directory):
+            if name.startswith("segment-") and name.endswith(".log"):
+                numbers.append(int(name[len("segment-"):-len(".log")]))
+        self._segments = sorted(numbers)
+        for number in self._segments:
+            index_path = self._index_path(number)
+            size = os.path.getsize(index_path) if os.path.exists(index_path) else 0
+            self._counts[number] = size // OFFSET.size
+        if self._segments:
+            self._recover(self._segments[-1])
+
+    def _recover(self, number):
+        """Rebuild the index of a segment whose tail was torn by a crash."""
+        segment_path = self._segment_path(number)
+        with open(segment_path, "rb") as f:
+            data = f.read()
+        offsets = []
+        end = 0
+        for offset, end, _ in decode_records(data):
+            offsets.append(offset)
+        if end != len(data) or len(offsets) != self._counts.get(number, 0):
+            with open(segment_path, "r+b") as f:
+                f.truncate(end)
+            with open(self._index_path(number), "wb") as f:
+                f.write(b"".join(OFFSET.pack(o) for o in offsets))
+            self._counts[number] = len(offsets)
+
+    def _migrate_legacy(self):
+        try:
+            with open(self.legacy_path, "r", encoding="utf-8") as f:
+                messages = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[ChatLog] Could not migrate {self.legacy_path}: {e}")
+            return
+        if isinstance(messages, list):
+            self.extend(messages)
+        os.replace(self.legacy_path, self.legacy_path + ".migrated")
+
+    # ---------- writing ----------
+
+    def _open_active(self):
+        if self._segment_file is not None:
+            return
+        if not self._segments:
+            self._segments.append(1)
+            self._counts[1] = 0
+        number = self._segments[-1]
+        self._segment_file = open(self._segment_path(number), "ab")
+        self._index_file = open(self._index_path(number), "ab")
+        self._segment_size = self._segment_file.tell()
+
+    def _close_active(self):
+        for f in (self._segment_file, self._index_file):
+            if f is not None:
+                f.close()
+        self._segment_file = None
+        self._index_file = None
+        self._segment_size = 0
+
+    def _roll_segment(self):
+        self._close_active()
+        number = self._segments[-1] + 1
+        self._segments.append(number)
+        self._counts[number] = 0
+        self._open_active()
+
+    def _write(self, messages, fsync=False):
+        self._open_active()
+        for message in messages:
+            record = encode_record(message)
+            if self._segment_size and self._segment_size + len(record) > self.segment_max_bytes:
+                self._roll_segment()
+            self._index_file.write(OFFSET.pack(self._segment_size))
+            self._segment_file.write(record)
+            self._segment_size += len(record)
+            self._counts[self._segments[-1]] += 1
+        self._segment_file.flush()
+        self._index_file.flush()
+        if fsync:
+            os.fsync(self._segment_file.fileno())
+            os.fsync(self._index_file.fileno())
+
+    def append(self, message: dict):
+        return self.extend([message])
+
+    def extend(self, messages):
+        """Queue messages on the writer (or write them now without one); returns
+        the Commit, already waited for unless the writer's mode is "async"."""
+        messages = list(messages)
+        if self.writer is None:
+            with self._lock:
+                self._write(messages)
+            return None
+        return self.writer.submit(self, messages)
+
+    def _track(self, commit):
+        with self._pending_lock:
+            self._pending.append(commit)
+
+    def _committed(self, commits):
+        with self._pending_lock:
+            done = set(map(id, commits))
+            self._pending = [c for c in self._pending if id(c) not in done]
+
+    def wait_pending(self):
+        """Block until every append queued so far has been written."""
+        with self._pending_lock:
+            pending = list(self._pending)
+        for commit in pending:
+            commit.wait()
+
+    # public methods wait for queued appends before taking the lock; the
+    # writer needs the lock to commit them, so nothing waits while holding it
+
+    def clear(self):
+        self.wait_pending()
+        with self._lock:
+            self._clear()
+
+    def _clear(self):
+        self._close_active()
+        for number in self._segments:
+            for path in (self._segment_path(number), self._index_path(number)):
+                if os.path.exists(path):
+                    os.remove(path)
+        self._segments = []
+        self._counts = {}
+        self.generation += 1
+
+    def replace(self, messages):
+        """Swap the whole history for messages (used by 'clear chat')."""
+        self.wait_pending()
+        with self._lock:
+            self._clear()
+            self._write(list(messages))
+
+    # ---------- reading ----------
+
+    def __len__(self):
+        self.wait_pending()
+        with self._lock:
+            return sum(self._counts.values())
+
+    def _read_segment(self, number, start=0):
+        with open(self._segment_path(number), "rb") as f:
+            f.seek(start)
+            return f.read()
+
+    def read_all(self) -> list:
+        self.wait_pending()
+        with self._lock:
+            return self._read_all()
+
+    def _read_all(self):
+        if self._segment_file is not None:
+            self._segment_file.flush()
+        messages = []
+        for number in self._segments:
+            messages.extend(m for _, _, m in decode_records(self._read_segment(number)))
+        return messages
+
+    def tail(self, n: int) -> list:
+        """Return the last n messages, oldest first."""
+        self.wait_pending()
+        with self._lock:
+            return self._tail(n)
+
+    def _tail(self, n):
+        chunks = []
+        remaining = n
+        for number in reversed(self._segments):
+            if remaining <= 0:
+                break
+            count = self._counts.get(number, 0)
+            take = min(remaining, count)
+            if not take:
+                continue
+            with open(self._index_path(number), "rb") as f:
+                f.seek((count - take) * OFFSET.size)
+                first_offset = OFFSET.unpack(f.read(OFFSET.size))[0]
+            data = self._read_segment(number, first_offset)
+            chunks.append([m for _, _, m in decode_records(data)][:take])
+            remaining -= take
+        messages = []
+        for chunk in reversed(chunks):
+            messages.extend(chunk)
+        return messages
+
+    def read_range(self, start: int, stop: int) -> list:
+        """Messages start..stop-1 counting from the oldest (0); only the
+        segments that hold them are read."""
+        self.wait_pending()
+        with self._lock:
+            if self._segment_file is not None:
+                self._segment_file.flush()
+            messages = []
+            first = 0  # index of the segment's first record
+            for number in self._segments:
+                count = self._counts.get(number, 0)
+                lo, hi = max(start, first), min(stop, first + count)
+                if lo < hi:
+                    with open(self._index_path(number), "rb") as f:
+                        f.seek((lo - first) * OFFSET.size)
+                        offset = OFFSET.unpack(f.read(OFFSET.size))[0]
+                    records = decode_records(self._read_segment(number, offset))
+                    messages.extend(m for _, (_, _, m) in zip(range(hi - lo), records))
+                first += count
+                if first >= stop:
+                    break
+            return messages
+
+    # ---------- maintenance ----------
+
+    def compact(self, keep_last=None):
+        """Rewrite the log into as few segments as possible, optionally keeping
+        only the most recent keep_last messages."""
+        self.wait_pending()
+        with self._lock:
+            messages = self._tail(keep_last) if keep_last is not None else self._read_all()
+            self._close_active()
+            staging = self.directory + ".compact"
+            retired = self.directory + ".old"
+            if os.path.isdir(staging):
+                shutil.rmtree(staging)
+            compacted = ChatLogStore(staging, legacy_path=None,
+                                     segment_max_bytes=self.segment_max_bytes)
+            compacted.extend(messages)
+            compacted.close()
+            os.rename(self.directory, retired)
+            os.rename(staging, self.directory)
+            shutil.rmtree(retired)
+            self._segments = []
+            self._counts = {}
+            self._load()
+            self.generation += 1
+
+    def close(self):
+        self.wait_pending()
+        with self._lock:
+            self._close_active()
+
+
+class HistoryPager:
+    """Pages backwards through a chat log, for front ends that show the most
+    recent turns first and load older ones as the user scrolls up."""
+
+    def __init__(self, store, page_size=50):
+        self.store = store
+        self.page_size = page_size
+        self.start = None  # index of the oldest message still shown
+        self.stop = None  # index after the newest message handed out
+        self._generation = None
+
+    def latest(self, count) -> list:
+        total = len(self.store)
+        self.start = max(0, total - count)
+        self.stop = total
+        self._generation = self.store.generation
+        return self.store.read_range(self.start, total)
+
+    def older(self) -> list:
+        """The page before the oldest message shown (the latest page on the
+        first call), [] when there is none."""
+        if self.start is None:
+            return self.latest(self.page_size)
+        if not self.start or self.store.generation != self._generation:
+            return []  # nothing older, or the log was cleared / compacted since
+        stop = self.start
+        self.start = max(0, stop - self.page_size)
+        return self.store.read_range(self.start, stop)
+
+    def forget(self, count=None):
+        """The count oldest messages shown were dropped from the view, so
+        older() pages them in again; None starts over from the latest page."""
+        if count is None or self.start is None:
+            self.start = self.stop = None
+        else:
+            self.start = min(self.start + count, self.stop)
+
+
+class Commit:
+    """One extend() call queued on the writer."""
+
+    def __init__(self, store, messages):
+        self.store = store
+        self.messages = messages
+        self.queued = time.perf_counter()
+        self.error = None
+        self._done = threading.Event()
+
+    def wait(self, timeout=None) -> bool:
+        return self._done.wait(timeout)
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+
+class ChatLogWriter:
+    """Single writer thread that turns concurrent appends into group commits."""
+
+    def __init__(self, flush_interval=FLUSH_INTERVAL, durability=DURABILITY, latency_window=1000):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"durability must be one of {DURABILITY_MODES}, not {durability!r}")
+        self.flush_interval = flush_interval
+        self.durability = durability
+        self._queue = queue.Queue()
+        self._latencies = deque(maxlen=latency_window)  # seconds from submit to commit
+        self._batch_sizes = deque(maxlen=latency_window)  # messages per group commit
+        self._counts = {"commits": 0, "messages": 0, "errors": 0}
+        self._thread = threading.Thread(target=self._run, name="chatlog-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, store, messages) -> Commit:
+        commit = Commit(store, messages)
+        store._track(commit)
+        self._queue.put(commit)
+        if self.durability != "async":
+            commit.wait()
+            if commit.error is not None:
+                raise commit.error
+        return commit
+
+    def _collect(self, first):
+        batch = [first]
+        deadline = time.perf_counter() + self.flush_interval
+        while True:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                return batch, False
+            if item is None:
+                return batch, True
+            batch.append(item)
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch, stopping = self._collect(first)
+            by_store = {}
+            for commit in batch:
+                by_store.setdefault(id(commit.store), []).append(commit)
+            for commits in by_store.values():
+                self._commit(commits[0].store, commits)
+
+    def _commit(self, store, commits):
+        messages = [m for commit in commits for m in commit.messages]
+        try:
+            with store._lock:
+                store._write(messages, fsync=self.durability == "fsync")
+        except Exception as e:
+            print(f"[ChatLog] Group commit to {store.directory} failed: {e}")
+            self._counts["errors"] += 1
+            for commit in commits:
+                commit.error = e
+        finished = time.perf_counter()
+        self._counts["commits"] += 1
+        self._counts["messages"] += len(messages)
+        self._batch_sizes.append(len(messages))
+        for commit in commits:
+            self._latencies.append(finished - commit.queued)
+        store._committed(commits)
+        for commit in commits:
+            commit._done.set()
+
+    def stats(self) -> dict:
+        latencies = sorted(self._latencies)
+        sizes = list(self._batch_sizes)
+
+        def percentile(p):
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000 if latencies else 0.0
+
+        return dict(self._counts,
+                    queued=self._queue.qsize(),
+                    avg_batch=sum(sizes) / len(sizes) if sizes else 0.0,
+                    max_batch=max(sizes, default=0),
+                    latency_p50_ms=percentile(0.50),
+                    latency_p95_ms=percentile(0.95),
+                    latency_max_ms=latencies[-1] * 1000 if latencies else 0.0)
+
+    def close(self, timeout=5):
+        """Commit whatever is queued and stop the thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+
+_shared_store = None
+_shared_writer = None
+_shared_lock = threading.Lock()
+
+
+def get_chat_log_writer() -> ChatLogWriter:
+    """Process-wide writer shared by every chat log store."""
+    global _shared_writer
+    with _shared_lock:
+        if _shared_writer is None:
+            _shared_writer = ChatLogWriter()
+            atexit.register(_shared_writer.close)
+        return _shared_writer
+
+
+def get_chat_log() -> ChatLogStore:
+    """Process-wide chat log used by every backend and front end."""
+    global _shared_store
+    writer = get_chat_log_writer()
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = ChatLogStore(writer=writer)
+        return _shared_store
+
+
+if __name__ == "__main__":
+    # Group-commit benchmark: concurrent writers into one store
+    import sys
+    import tempfile
+    from concurrent.futures import ThreadPoolExecutor
+
+    writers, turns = 16, 200
+    for durability in sys.argv[1:] or DURABILITY_MODES:
+        writer = ChatLogWriter(durability=durability)
+        store = ChatLogStore(tempfile.mkdtemp(prefix="chatlog-bench-"), legacy_path=None, writer=writer)
+
+        def talk(n):
+            for i in range(turns):
+                store.extend([{"role": "user", "content": f"{n}:{i}"}, {"role": "assistant", "content": "ok"}])
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=writers) as pool:
+            list(pool.map(talk, range(writers)))
+        count = len(store)
+        elapsed = time.perf_counter() - started
+        assert count == writers * turns * 2, count
+        stats = writer.stats()
+        print(f"{durability:>6}: {count} messages in {elapsed:.2f}s, {stats['commits']} commits, "
+              f"avg batch {stats['avg_batch']:.1f}, p95 latency {stats['latency_p95_ms']:.1f} ms")
+        store.close()
+        writer.close()
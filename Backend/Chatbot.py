@@ -1,27 +1,31 @@
-import os
 import datetime
-from json import load, dump
-import google.generativeai as genai
-from dotenv import dotenv_values
 from rich.console import Console
 from rich.prompt import Prompt
+from Backend.ChatLog import get_chat_log
+from Backend.Sessions import default_conversation
+from Backend.ContextWindow import ContextWindow, model_summariser
+from Backend.Retry import stream_with_retry
+from Backend.Config import get_config, gemini_model
 
 # Initialize rich console
 console = Console()
 
-# Load environment variables
-env = dotenv_values(".env")
-GeminiAPIKey = env.get("GeminiAPIKey")
-Username = env.get("Username", "User")
-Assistantname = env.get("Assistantname", "Assistant")
-
-# Initialize Gemini client
-genai.configure(api_key=GeminiAPIKey)
-model = genai.GenerativeModel('gemini-pro')
+config = get_config()
+Username = config.username
+Assistantname = config.assistantname
 
 # Constants
-CHAT_LOG_PATH = "Data/ChatLog.json"
 MAX_TOKENS = 1024
+# Prompt history budget; set SummariseHistory=True to fold older turns into a summary
+CONTEXT_TOKENS = config.int("ChatContextTokens", 3000)
+SUMMARISE_HISTORY = config.bool("SummariseHistory")
+
+# every conversation gets its own window over its own log
+def NewContextWindow():
+    return ContextWindow(
+        budget_tokens=CONTEXT_TOKENS,
+        summariser=model_summariser() if SUMMARISE_HISTORY else None,
+    )
 
 # System prompt
 #here the llm model got train 
@@ -35,21 +39,13 @@ Hello, I am {Username}, You are a very accurate and advanced AI chatbot named {A
 
 SystemChatBot = [{"role": "system", "content": SystemPrompt.strip()}]
 
-##it load chat from file ki agar json mai pehele se exist krta hai to yie wo response dega if not then ye directory banake hmko store krne ko dega 
+##chat history ab shared append-only store (Backend/ChatLog.py) se aati hai, har turn pe puri file dobara nahi likhi jati
 def load_chat_log():
-    if not os.path.exists("Data"):
-        os.makedirs("Data")
-    if not os.path.exists(CHAT_LOG_PATH):
-        with open(CHAT_LOG_PATH, "w") as f:
-            dump([], f)
-        return []
-    with open(CHAT_LOG_PATH, "r") as f:
-        return load(f)
+    return get_chat_log().read_all()
 
 
 def save_chat_log(messages):
-    with open(CHAT_LOG_PATH, "w") as f:
-        dump(messages, f, indent=4)
+    get_chat_log().replace(messages)
 
 
 def RealtimeInformation():
@@ -67,45 +63,54 @@ def RealtimeInformation():
 def AnswerModifier(answer):
     return "\n".join(line.strip() for line in answer.splitlines() if line.strip())
 
+FailureReply = "Sorry, I could not reach the language model right now. Please try again in a moment."
+
 #chatbot is format mai save krega files ko in json file
-def ChatBot(user_query: str):
-    messages = load_chat_log()
-    messages.append({"role": "user", "content": user_query})
+def ChatBotStream(user_query: str, conversation=None):
+    """Yield the answer chunk by chunk as Gemini produces it; the turn is
+    saved to the conversation's chat log (the shared one by default) once
+    the stream ends."""
+    conversation = conversation or default_conversation()
+    context_window = conversation.window("chat", NewContextWindow)
+    messages = [{"role": "user", "content": user_query}]
+    answer = ""
 
     try:
-        # Build conversation history for Gemini
-        conversation_text = SystemPrompt + "\n" + RealtimeInformation() + "\n\n"
-        for msg in messages:
-            role = "User" if msg["role"] == "user" else "Assistant"
-            conversation_text += f"{role}: {msg['content']}\n"
+        # Build conversation from the recent turns that fit the token budget
+        context_window.sync(conversation.log)
+        conversation_text = (
+            SystemPrompt + "\n" + RealtimeInformation() + "\n\n"
+            + context_window.text()
+            + f"User: {user_query}\n"
+        )
         
         # Generate response with Gemini
-        response = model.generate_content(
-            conversation_text,
-            generation_config=genai.types.GenerationConfig(
-                max_output_tokens=MAX_TOKENS,
-                temperature=0.7,
-            ),
-            stream=True
-        )
+        def open_stream():
+            response = gemini_model().generate_content(
+                conversation_text,
+                generation_config={"max_output_tokens": MAX_TOKENS, "temperature": 0.7},
+                stream=True
+            )
+            return (chunk.text for chunk in response if chunk.text)
+
+        for chunk in stream_with_retry("gemini", open_stream):
+            answer += chunk
+            yield chunk
 
-        answer = ""
-        for chunk in response:
-            if chunk.text:
-                print(chunk.text, end="", flush=True)
-                answer += chunk.text
+    except Exception as e:
+        # bounded retries already happened; a failed turn is not saved
+        console.print(f"[red]Error occurred:[/red] {e}")
+        if not answer:
+            yield FailureReply
+            return
 
-        print()  # Finish the line
-        answer = answer.strip()
-        messages.append({"role": "assistant", "content": answer})
-        save_chat_log(messages)
+    # a stream cut off midway is saved as far as the user saw it
+    messages.append({"role": "assistant", "content": answer.strip()})
+    conversation.log.extend(messages)
 
-        return AnswerModifier(answer)
 
-    except Exception as e:
-        console.print(f"[red]Error occurred:[/red] {e}")
-        save_chat_log([])  # Reset chat if corrupted
-        return ChatBot(user_query)
+def ChatBot(user_query: str, conversation=None):
+    return AnswerModifier("".join(ChatBotStream(user_query, conversation)))
 
 
 # --------------------------
@@ -128,7 +133,9 @@ if __name__ == "__main__":
                 console.print("[yellow]Chat history cleared.[/yellow]\n")
                 continue
 
-            ChatBot(query)
+            for chunk in ChatBotStream(query):
+                console.print(chunk, end="", markup=False)
+            console.print()
 
         except KeyboardInterrupt:
             console.print("\n[red]Interrupted by user.[/red]")
@@ -0,0 +1,278 @@
+"""
+Registry of automation commands ("open", "google search", ...).
+
+Handlers register under a command prefix with some metadata:
+
+    @registry.command("open", idempotent=True, description="Open an app or website")
+    def OpenApp(app_name): ...
+
+Routing walks a word trie once per command, so "google search cats" finds
+the "google search" handler and "openai news" does not match "open".
+Entry points ask registry.is_command() instead of keeping their own
+Functions lists.
+
+blocking=True handlers are plain functions run on the executor's bounded
+thread pool; blocking=False handlers are coroutine functions awaited on the
+loop. idempotent=True commands run once per batch even if the decision
+repeats them. timeout overrides the executor's per-task default.
+
+AutomationExecutor runs a batch with at most max_workers tasks at once and
+streams a TaskResult (status, value, error, duration) for each command as it
+finishes:
+
+    async for result in executor.stream(["open chrome", "play lofi"]):
+        print(result)
+
+Plugins: every module in the top-level Plugins/ folder and every module
+named in the CommandPlugins .env entry (comma separated) is imported and
+its register(registry) function called.
+"""
+
+import os
+import time
+import asyncio
+import functools
+import importlib
+import importlib.util
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from Backend.Config import get_config
+
+config = get_config()
+PLUGIN_DIR = "Plugins"
+AUTOMATION_WORKERS = config.int("AutomationWorkers", 4)
+AUTOMATION_TIMEOUT = config.float("AutomationTimeout", 30)
+
+
+class Command:
+    def __init__(self, prefix, handler, blocking=True, idempotent=False, description="", timeout=None):
+        self.prefix = prefix
+        self.handler = handler
+        self.blocking = blocking
+        self.idempotent = idempotent
+        self.description = description
+        self.timeout = timeout  # seconds, None = executor default
+
+    def __repr__(self):
+        return f"Command({self.prefix!r})"
+
+
+class CommandRegistry:
+    def __init__(self):
+        self._trie = {}  # word -> child node; the "" key holds the Command
+        self._commands = {}
+        self._lock = threading.Lock()
+        self._plugins_loaded = False
+
+    def register(self, prefix, handler, blocking=True, idempotent=False, description="", timeout=None):
+        prefix = " ".join(prefix.lower().split())
+        command = Command(prefix, handler, blocking, idempotent, description, timeout)
+        with self._lock:
+            node = self._trie
+            for word in prefix.split():
+                node = node.setdefault(word, {})
+            node[""] = command
+            self._commands[prefix] = command
+        return command
+
+    def command(self, prefix, **options):
+        """Decorator form of register()."""
+        def decorator(handler):
+            self.register(prefix, handler, **options)
+            return handler
+        return decorator
+
+    def match(self, text):
+        """(Command, argument) for the longest registered prefix of text, or (None, text)."""
+        words = text.lower().split()
+        node = self._trie
+        found, consumed = None, 0
+        for i, word in enumerate(words):
+            node = node.get(word)
+            if node is None:
+                break
+            if "" in node:
+                found, consumed = node[""], i + 1
+        if found is None:
+            return None, text
+        return found, " ".join(words[consumed:])
+
+    def is_command(self, text) -> bool:
+        return self.match(text)[0] is not None
+
+    def commands(self) -> list:
+        with self._lock:
+            return list(self._commands.values())
+
+    def route(self, texts):
+        """[(Command, argument)] for the texts that are commands, duplicates of
+        idempotent commands removed; unknown texts are reported and skipped."""
+        routed, seen = [], set()
+        for text in texts:
+            command, argument = self.match(text)
+            if command is None:
+                print(f"Unknown command: {text}")
+                continue
+            if command.idempotent:
+                if (command.prefix, argument) in seen:
+                    continue
+                seen.add((command.prefix, argument))
+            routed.append((command, argument))
+        return routed
+
+    def load_plugins(self, directory=PLUGIN_DIR, modules=None):
+        """Import plugin modules once and let each register(registry) itself."""
+        with self._lock:
+            if self._plugins_loaded:
+                return
+            self._plugins_loaded = True
+        if modules is None:
+            modules = get_config().list("CommandPlugins")
+        loaded = []
+        for name in modules:
+            try:
+                loaded.append(importlib.import_module(name))
+            except Exception as e:
+                print(f"Could not load command plugin {name}: {e}")
+        if os.path.isdir(directory):
+            for filename in sorted(os.listdir(directory)):
+                if not filename.endswith(".py") or filename.startswith("_"):
+                    continue
+                try:
+                    spec = importlib.util.spec_from_file_location(f"axis_plugin_{filename[:-3]}", os.path.join(directory, filename))
+                    module = importlib.util.module_from_spec(spec)
+                    spec.loader.exec_module(module)
+                    loaded.append(module)
+                except Exception as e:
+                    print(f"Could not load command plugin {filename}: {e}")
+        for module in loaded:
+            register = getattr(module, "register", None)
+            if register is None:
+                print(f"Command plugin {module.__name__} has no register(registry) function")
+                continue
+            try:
+                register(self)
+            except Exception as e:
+                print(f"Command plugin {module.__name__} failed to register: {e}")
+
+
+class TaskResult:
+    def __init__(self, text, command, argument):
+        self.text = text
+        self.command = command
+        self.argument = argument
+        self.status = "pending"  # running, then ok / error / timeout / cancelled
+        self.value = None
+        self.error = None
+        self.duration = 0.0
+        self.cancel_requested = False
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+    def __repr__(self):
+        detail = f" {self.error}" if self.error else ""
+        return f"<{self.text!r} {self.status} {self.duration * 1000:.0f}ms{detail}>"
+
+
+class AutomationBatch:
+    """Commands of one decision running on an executor; iterate it with
+    `async for` to get each TaskResult as soon as it finishes."""
+
+    def __init__(self, executor, routed):
+        self.results = []
+        self._tasks = []
+        for command, argument in routed:
+            result = TaskResult(f"{command.prefix} {argument}".strip(), command, argument)
+            self.results.append(result)
+            self._tasks.append(asyncio.ensure_future(executor._run(result)))
+
+    async def __aiter__(self):
+        try:
+            for next_done in asyncio.as_completed(self._tasks):
+                yield await next_done
+        finally:
+            self.cancel()  # consumer stopped early
+
+    def cancel(self, index=None):
+        """Cancel one task by its position, or every unfinished one (call from the loop)."""
+        indexes = range(len(self._tasks)) if index is None else [index]
+        for i in indexes:
+            task, result = self._tasks[i], self.results[i]
+            if task.done():
+                continue
+            result.cancel_requested = True  # a task that has not started yet just returns
+            if result.status == "running":
+                task.cancel()
+
+
+class AutomationExecutor:
+    """Runs commands with a concurrency cap and a timeout per task.
+
+    A timed-out blocking handler cannot be interrupted; its result is
+    reported as "timeout" and the thread is released when the call returns.
+    """
+
+    def __init__(self, registry, max_workers=AUTOMATION_WORKERS, timeout=AUTOMATION_TIMEOUT):
+        self.registry = registry
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="automation")
+        self._slots = weakref.WeakKeyDictionary()  # event loop -> asyncio.Semaphore
+
+    def _loop_slots(self):
+        # the pool caps threads globally; this also caps coroutine handlers per loop
+        loop = asyncio.get_running_loop()
+        if loop not in self._slots:
+            self._slots[loop] = asyncio.Semaphore(self.max_workers)
+        return self._slots[loop]
+
+    async def _run(self, result):
+        command = result.command
+        timeout = command.timeout or self.timeout
+        started = time.perf_counter()
+        try:
+            async with self._loop_slots():
+                if result.cancel_requested:
+                    raise asyncio.CancelledError
+                result.status = "running"
+                started = time.perf_counter()  # queueing for a slot is not the task's time
+                if command.blocking:
+                    loop = asyncio.get_running_loop()
+                    call = loop.run_in_executor(self._pool, functools.partial(command.handler, result.argument))
+                else:
+                    call = command.handler(result.argument)
+                result.value = await asyncio.wait_for(call, timeout)
+                result.status = "ok"
+        except asyncio.TimeoutError:
+            result.status, result.error = "timeout", f"no result after {timeout:g}s"
+        except asyncio.CancelledError:
+            result.status = "cancelled"
+        except Exception as e:
+            result.status, result.error = "error", str(e)
+        result.duration = time.perf_counter() - started
+        return result
+
+    def submit(self, texts) -> AutomationBatch:
+        """Start every command in texts; must be called from a running event loop."""
+        return AutomationBatch(self, self.registry.route(texts))
+
+    async def stream(self, texts):
+        async for result in self.submit(texts):
+            yield result
+
+    async def run(self, texts) -> list:
+        """Every TaskResult in command order, once all have finished."""
+        batch = self.submit(texts)
+        async for _ in batch:
+            pass
+        return batch.results
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
+
+
+registry = CommandRegistry()
+executor = AutomationExecutor(registry)
@@ -0,0 +1,142 @@
+"""
+Settings from .env, parsed once, and the LLM clients shared by every backend.
+
+    from Backend.Config import get_config, gemini_model, cohere_client
+    config = get_config()
+    config.username, config.gemini_api_key          # typed attributes
+    config.int("SearchCacheTTL", 3 * 3600)          # any other .env entry
+    gemini_model().generate_content(...)            # one configured client per process
+
+A Config is read-only; reload_config() parses .env again and swaps in a new
+one. Clients are built on first use and rebuilt after a reload that changed
+their API key, so callers should ask for them at call time instead of
+keeping a module-level reference. Values a module derived at import time
+(prompt text, cache TTLs) keep their value until restart.
+"""
+
+import threading
+from collections.abc import Mapping
+from typing import Optional
+from dotenv import dotenv_values
+
+ENV_PATH = ".env"
+GEMINI_MODEL = "gemini-pro"
+TRUE_VALUES = ("1", "true", "yes", "on")
+
+
+class Config(Mapping):
+    """Immutable view of one parse of .env."""
+
+    username: str
+    assistantname: str
+    gemini_api_key: Optional[str]
+    cohere_api_key: Optional[str]
+    huggingface_api_key: Optional[str]
+    weather_api_key: Optional[str]
+    assistant_voice: Optional[str]
+    input_language: str
+
+    def __init__(self, values=None, path=ENV_PATH):
+        values = {key: value for key, value in (values or {}).items() if value is not None}
+        object.__setattr__(self, "_values", values)
+        object.__setattr__(self, "path", path)
+        for attribute, key, default in (
+            ("username", "Username", "User"),
+            ("assistantname", "Assistantname", "Assistant"),
+            ("gemini_api_key", "GeminiAPIKey", None),
+            ("cohere_api_key", "CohereAPIKey", None),
+            ("huggingface_api_key", "HuggingFaceAPIKey", None),
+            ("weather_api_key", "WeatherAPIKey", None),
+            ("assistant_voice", "AssistantVoice", None),
+            ("input_language", "InputLanguage", "en"),
+        ):
+            object.__setattr__(self, attribute, values.get(key) or default)
+
+    @classmethod
+    def load(cls, path=ENV_PATH, overrides=None):
+        values = dict(dotenv_values(path))
+        values.update(overrides or {})
+        return cls(values, path)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Config is read-only, use reload_config()")
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def int(self, key, default=0) -> int:
+        return int(self._values.get(key, default))
+
+    def float(self, key, default=0.0) -> float:
+        return float(self._values.get(key, default))
+
+    def bool(self, key, default=False) -> bool:
+        return str(self._values.get(key, default)).lower() in TRUE_VALUES
+
+    def list(self, key) -> list:
+        """Comma separated entry as a list of stripped, non-empty strings."""
+        return [item.strip() for item in self._values.get(key, "").split(",") if item.strip()]
+
+    def __repr__(self):
+        return f"Config({self.path!r}, {len(self)} entries)"
+
+
+_lock = threading.RLock()
+_config = None
+_clients = {}  # name -> (api key it was built with, client)
+
+
+def get_config() -> Config:
+    global _config
+    if _config is None:
+        with _lock:
+            if _config is None:
+                _config = Config.load()
+    return _config
+
+
+def reload_config(path=ENV_PATH, overrides=None) -> Config:
+    """Parse .env again; overrides (key -> value) win over the file."""
+    global _config
+    config = Config.load(path, overrides)
+    with _lock:
+        _config = config
+    return config
+
+
+def _client(name, api_key, build):
+    with _lock:
+        cached = _clients.get(name)
+        if cached is None or cached[0] != api_key:
+            cached = (api_key, build())
+            _clients[name] = cached
+        return cached[1]
+
+
+def gemini_model(model_name=GEMINI_MODEL):
+    """Shared GenerativeModel; google.generativeai is imported on first use."""
+    api_key = get_config().gemini_api_key
+
+    def build():
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)  # process-wide, done once per key
+        return genai.GenerativeModel(model_name)
+
+    return _client(f"gemini:{model_name}", api_key, build)
+
+
+def cohere_client():
+    """Shared cohere.Client; cohere is imported on first use."""
+    api_key = get_config().cohere_api_key
+
+    def build():
+        import cohere
+        return cohere.Client(api_key=api_key)
+
+    return _client("cohere", api_key, build)
@@ -0,0 +1,144 @@
+"""
+Token-budgeted prompt window over the shared chat log.
+
+Instead of joining every message in the chat log into the prompt on every
+call, a ContextWindow keeps the rendered lines of the most recent turns that
+fit a token budget and only reads the records that were appended since the
+last request. Turns that fall out of the window can optionally be folded into
+a rolling summary by a summariser callable.
+"""
+
+import threading
+from collections import deque
+
+CHARS_PER_TOKEN = 4  # rough estimate, good enough for budgeting
+DEFAULT_BUDGET_TOKENS = 3000
+SUMMARY_BATCH_TOKENS = 500  # summarise evicted turns in batches, not per turn
+MAX_DELTA_RECORDS = 64  # beyond this, rebuild the window instead of replaying
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def render_message(message: dict) -> str:
+    role = "User" if message.get("role") == "user" else "Assistant"
+    return f"{role}: {message.get('content', '')}\n"
+
+
+class ContextWindow:
+    """Most recent chat turns that fit budget_tokens, rendered for the prompt.
+
+    summariser, if given, is called as summariser(previous_summary, lines)
+    and must return the new summary text.
+    """
+
+    def __init__(self, budget_tokens=DEFAULT_BUDGET_TOKENS, summariser=None):
+        self.budget_tokens = budget_tokens
+        self.summariser = summariser
+        self.summary = ""
+        self._lock = threading.Lock()
+        self._lines = deque()  # (line, tokens)
+        self._tokens = 0
+        self._evicted = []
+        self._evicted_tokens = 0
+        self._text = None
+        self._synced = (None, 0)  # (store generation, record count)
+
+    def reset(self):
+        with self._lock:
+            self._reset()
+
+    def _reset(self):
+        self._lines.clear()
+        self._tokens = 0
+        self._evicted = []
+        self._evicted_tokens = 0
+        self.summary = ""
+        self._text = ""
+        self._synced = (None, 0)
+
+    def _push(self, message):
+        line = render_message(message)
+        tokens = estimate_tokens(line)
+        self._lines.append((line, tokens))
+        self._tokens += tokens
+        if self._text is not None:
+            self._text += line
+        while self._tokens > self.budget_tokens and len(self._lines) > 1:
+            old_line, old_tokens = self._lines.popleft()
+            self._tokens -= old_tokens
+            self._text = None
+            if self.summariser is not None:
+                self._evicted.append(old_line)
+                self._evicted_tokens += old_tokens
+
+    def push(self, message: dict):
+        with self._lock:
+            self._push(message)
+
+    def _hydrate(self, store, count):
+        # grow the tail read until it covers the budget or the whole log
+        take = 16
+        while True:
+            messages = store.read_range(max(0, count - take), count)
+            tokens = sum(estimate_tokens(render_message(m)) for m in messages)
+            if tokens >= self.budget_tokens or take >= count:
+                break
+            take *= 2
+        for message in messages:
+            self._push(message)
+
+    def sync(self, store):
+        """Bring the window up to date with the records in store."""
+        with self._lock:
+            generation, count = store.generation, len(store)
+            synced_generation, synced_count = self._synced
+            if generation == synced_generation and count == synced_count:
+                return
+            if generation != synced_generation or count < synced_count \
+                    or count - synced_count > MAX_DELTA_RECORDS:
+                self._reset()
+                self._hydrate(store, count)
+            else:
+                # by position, so an append after len() is left for the next sync
+                for message in store.read_range(synced_count, count):
+                    self._push(message)
+            self._synced = (generation, count)
+
+    def _summarise(self):
+        if self.summariser is None or self._evicted_tokens < SUMMARY_BATCH_TOKENS:
+            return
+        try:
+            self.summary = self.summariser(self.summary, self._evicted)
+        except Exception as e:
+            print(f"[ContextWindow] Summary update failed: {e}")
+            return
+        self._evicted = []
+        self._evicted_tokens = 0
+
+    def text(self) -> str:
+        """Rendered history for the prompt (summary first, if any)."""
+        with self._lock:
+            self._summarise()
+            if self._text is None:
+                self._text = "".join(line for line, _ in self._lines)
+            if self.summary:
+                return f"Summary of the earlier conversation:\n{self.summary}\n\n{self._text}"
+            return self._text
+
+
+def model_summariser(model=None, max_output_tokens=256):
+    """Summariser backed by a Gemini GenerativeModel (the shared one by default)."""
+    def summarise(previous_summary, lines):
+        from Backend.Config import gemini_model
+        prompt = "Summarise this conversation in a few sentences. Keep names, facts and open questions.\n\n"
+        if previous_summary:
+            prompt += f"Earlier summary:\n{previous_summary}\n\n"
+        prompt += "".join(lines)
+        response = (model or gemini_model()).generate_content(
+            prompt,
+            generation_config={"max_output_tokens": max_output_tokens, "temperature": 0.3},
+        )
+        return response.text.strip()
+    return summarise
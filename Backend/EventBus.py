@@ -0,0 +1,210 @@
+"""
+In-process publish/subscribe bus for assistant state.
+
+Replaces the Frontend/Files/*.data files that the GUI and the backend thread
+used to poll. Every topic keeps its last value, so late subscribers and
+getters still see the current state:
+
+    bus.publish("status", "Listening...")
+    bus.subscribe("status", label.setText)
+    bus.wait_for("mic", lambda v: v == "True")   # blocks, no polling
+
+Subprocesses reach the same bus over a multiprocessing connection (Unix
+socket on POSIX, localhost TCP elsewhere): the parent calls serve_bus(),
+which exports AXIS_BUS_ADDRESS and a random AXIS_BUS_AUTHKEY, and the child
+calls connect_bus(). Without the key no other local process can connect.
+"""
+
+import os
+import socket
+import tempfile
+import threading
+from multiprocessing.connection import Listener, Client
+
+BUS_ADDRESS_ENV = "AXIS_BUS_ADDRESS"
+BUS_AUTHKEY_ENV = "AXIS_BUS_AUTHKEY"  # hex, only children started after serve_bus() get it
+
+
+class EventBus:
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._values = {}
+        self._subscribers = {}  # topic -> [callback(value)]
+        self._listeners = []  # callback(topic, value) for every topic
+
+    def publish(self, topic, value):
+        with self._cond:
+            self._values[topic] = value
+            callbacks = list(self._subscribers.get(topic, ()))
+            listeners = list(self._listeners)
+            self._cond.notify_all()
+        for callback in callbacks:
+            try:
+                callback(value)
+            except Exception as e:
+                print(f"[EventBus] Subscriber for '{topic}' failed: {e}")
+        for listener in listeners:
+            try:
+                listener(topic, value)
+            except Exception as e:
+                print(f"[EventBus] Listener failed on '{topic}': {e}")
+
+    def subscribe(self, topic, callback, replay=True):
+        """Call callback(value) on every publish; returns an unsubscribe function."""
+        with self._cond:
+            self._subscribers.setdefault(topic, []).append(callback)
+            has_value = topic in self._values
+            value = self._values.get(topic)
+        if replay and has_value:
+            callback(value)
+
+        def unsubscribe():
+            with self._cond:
+                if callback in self._subscribers.get(topic, ()):
+                    self._subscribers[topic].remove(callback)
+        return unsubscribe
+
+    def add_listener(self, listener):
+        with self._cond:
+            self._listeners.append(listener)
+
+    def get(self, topic, default=None):
+        with self._cond:
+            return self._values.get(topic, default)
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            return dict(self._values)
+
+    def wait_for(self, topic, predicate=lambda value: True, timeout=None):
+        """Block until predicate(value) holds for topic; None on timeout."""
+        with self._cond:
+            ready = self._cond.wait_for(
+                lambda: topic in self._values and predicate(self._values[topic]), timeout
+            )
+            return self._values[topic] if ready else None
+
+
+def _family():
+    return "AF_UNIX" if os.name == "posix" and hasattr(socket, "AF_UNIX") else "AF_INET"
+
+
+def _encode_address(address):
+    return address if isinstance(address, str) else f"{address[0]}:{address[1]}"
+
+
+def _decode_address(text):
+    host, _, port = text.rpartition(":")
+    return (host, int(port)) if port.isdigit() and host else text
+
+
+class BusServer:
+    """Shares a local bus with subprocesses over multiprocessing connections."""
+
+    def __init__(self, bus, address=None, authkey=None):
+        self.bus = bus
+        self.authkey = authkey or os.urandom(32)
+        family = _family()
+        if address is None:
+            if family == "AF_UNIX":
+                address = os.path.join(tempfile.gettempdir(), f"axis-bus-{os.getpid()}.sock")
+            else:
+                address = ("127.0.0.1", 0)
+        self._listener = Listener(address, family=family, authkey=self.authkey)
+        self.address = self._listener.address
+        self._clients = []
+        self._lock = threading.Lock()
+        self._receiving = threading.local()
+        bus.add_listener(self._forward)
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    def _accept_loop(self):
+        while True:
+            try:
+                conn = self._listener.accept()
+            except (OSError, EOFError):
+                return
+            with self._lock:
+                self._clients.append(conn)
+                for topic, value in self.bus.snapshot().items():
+                    conn.send((topic, value))
+            threading.Thread(target=self._read_loop, args=(conn,), daemon=True).start()
+
+    def _read_loop(self, conn):
+        self._receiving.conn = conn
+        while True:
+            try:
+                topic, value = conn.recv()
+            except (OSError, EOFError):
+                break
+            self.bus.publish(topic, value)
+        with self._lock:
+            if conn in self._clients:
+                self._clients.remove(conn)
+
+    def _forward(self, topic, value):
+        origin = getattr(self._receiving, "conn", None)
+        with self._lock:
+            for conn in list(self._clients):
+                if conn is origin:
+                    continue
+                try:
+                    conn.send((topic, value))
+                except (OSError, EOFError):
+                    self._clients.remove(conn)
+
+    def close(self):
+        self._listener.close()
+
+
+class RemoteBus(EventBus):
+    """Bus mirror inside a subprocess; publishes go to the parent's bus."""
+
+    def __init__(self, address, authkey):
+        super().__init__()
+        self._conn = Client(address, family=_family(), authkey=authkey)
+        self._send_lock = threading.Lock()
+        threading.Thread(target=self._read_loop, daemon=True).start()
+
+    def _read_loop(self):
+        while True:
+            try:
+                topic, value = self._conn.recv()
+            except (OSError, EOFError):
+                return
+            EventBus.publish(self, topic, value)
+
+    def publish(self, topic, value):
+        with self._send_lock:
+            self._conn.send((topic, value))
+        super().publish(topic, value)
+
+    def close(self):
+        self._conn.close()
+
+
+bus = EventBus()
+_server = None
+
+
+def serve_bus() -> BusServer:
+    """Expose the process bus to child processes (idempotent)."""
+    global _server
+    if _server is None:
+        _server = BusServer(bus)
+        os.environ[BUS_ADDRESS_ENV] = _encode_address(_server.address)
+        os.environ[BUS_AUTHKEY_ENV] = _server.authkey.hex()
+    return _server
+
+
+def connect_bus():
+    """Connect to the parent's bus, or None when not started by one."""
+    address = os.environ.get(BUS_ADDRESS_ENV)
+    authkey = os.environ.get(BUS_AUTHKEY_ENV)
+    if not address or not authkey:
+        return None
+    try:
+        return RemoteBus(_decode_address(address), bytes.fromhex(authkey))
+    except (OSError, EOFError, ValueError) as e:
+        print(f"[EventBus] Could not connect to {address}: {e}")
+        return None
@@ -0,0 +1,93 @@
+"""
+Shared HTTP client for the backend's own outbound calls (Hugging Face,
+ipinfo / OpenWeatherMap, Google lookups in Automation).
+
+    from Backend.HTTP import get_http_client
+    response = get_http_client().get(url, params={...})
+
+One requests.Session with a pooled HTTPAdapter is kept for the process, so
+connections (and their TLS handshakes) are reused per host instead of being
+paid on every call. Each host also gets a semaphore that caps how many
+requests are in flight at once; Hugging Face is limited harder because it
+rate limits parallel image requests.
+
+This stays on requests/urllib3, which only speaks HTTP/1.1: requests is
+already a dependency, every caller is synchronous or runs in a worker thread,
+and the hosts we call see one or a few requests per turn, so keep-alive is
+where the handshake savings come from. httpx + h2 would add two packages for
+multiplexing we would rarely use. The SDK clients (google-generativeai,
+cohere) and googlesearch manage their own connections.
+"""
+
+import asyncio
+import threading
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from Backend.Config import get_config
+
+config = get_config()
+
+# (connect, read) seconds; callers can pass timeout= for slow endpoints
+DEFAULT_TIMEOUT = (config.float("HTTPConnectTimeout", 5), config.float("HTTPReadTimeout", 30))
+DEFAULT_MAX_PER_HOST = config.int("HTTPMaxPerHost", 8)
+HOST_LIMITS = {
+    "api-inference.huggingface.co": 4,
+}
+
+
+class HTTPClient:
+    def __init__(self, timeout=DEFAULT_TIMEOUT, max_per_host=DEFAULT_MAX_PER_HOST, host_limits=None):
+        self.timeout = timeout
+        self.max_per_host = max_per_host
+        self.host_limits = dict(HOST_LIMITS if host_limits is None else host_limits)
+        self.session = requests.Session()
+        # keep at least as many pooled connections per host as may be in flight
+        pool_size = max([max_per_host] + list(self.host_limits.values()))
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._counts = {}  # host -> requests sent
+
+    def _host_semaphore(self, url):
+        host = urlsplit(url).hostname or ""
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.host_limits.get(host, self.max_per_host))
+            self._counts[host] = self._counts.get(host, 0) + 1
+            return self._semaphores[host]
+
+    def request(self, method, url, timeout=None, **kwargs):
+        with self._host_semaphore(url):
+            return self.session.request(method, url, timeout=timeout or self.timeout, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    async def arequest(self, method, url, **kwargs):
+        """request() from async code; the blocking call runs in a worker thread."""
+        return await asyncio.to_thread(self.request, method, url, **kwargs)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._counts)
+
+    def close(self):
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HTTPClient:
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HTTPClient()
+        return _client
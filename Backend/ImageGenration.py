@@ -1,115 +1,241 @@
 import asyncio
-import os 
-import requests
+import uuid
+import time
+import threading
 from random import randint
-from time import sleep
-from PIL import Image
-from dotenv import get_key
-from datetime import datetime
+from Backend.Retry import call_with_retry, RetryError
+from Backend.EventBus import bus
+from Backend.HTTP import get_http_client
+from Backend.ImageStore import image_store
+from Backend.Config import get_config
 
 # === Configuration ===
 HF_MODEL_URL = "https://api-inference.huggingface.co/models/stabilityai/stable-diffusion-xl-base-1.0"
-HF_API_KEY = get_key(".env", "HuggingFaceAPIKey") #env key access ho gya
-HEADERS = {"Authorization": f"Bearer {HF_API_KEY}"} 
 
-DATA_DIR = "Data" # folder jahan image save hoga
-STATUS_FILE = os.path.join("Frontend", "Files", "ImageGeneration.data") # Ye file "Frontend/Files/" folder me hogi aur is file se prompt aur status read kiya jayega
-IMAGE_COUNT = 4 
+IMAGE_COUNT = 4
+FINISHED_JOBS_KEPT = get_config().int("ImageJobsKept", 16)  # finished jobs (and their bytes) kept for get()
 
-# === Ensure directories exist ===
-os.makedirs(DATA_DIR, exist_ok=True)
 
-#prompt ko safe filename mai convert krega spaces ko underscores mai,lowercase mai
-def sanitize_filename(text: str) -> str:
-    return "_".join(text.strip().split()).lower()
-
-
-def open_images(prompt: str): # this opens and show images ek ek krke
-    safe_prompt = sanitize_filename(prompt)
-    for i in range(1, IMAGE_COUNT + 1):
-        img_path = os.path.join(DATA_DIR, f"{safe_prompt}_{i}.jpg") #create image path
+def open_images(images): # this opens and show images ek ek krke, memory se hi
+    for stored in images:
         try:
-            img = Image.open(img_path) #it open image
-            print(f"[INFO] Opening: {img_path}")
-            img.show() #show image
-            sleep(1) # delay 1 second ka 
+            print(f"[INFO] Opening: {stored.path}")
+            stored.image().show() #show image
         except IOError:
-            print(f"[ERROR] Could not open image: {img_path}")
+            print(f"[ERROR] Could not open image: {stored.path}")
 
 
 async def fetch_image(payload):
     try:
+        # 429 / 5xx (model loading, overloaded) are retried with backoff and open the breaker
         response = await asyncio.to_thread(
-            requests.post, HF_MODEL_URL, headers=HEADERS, json=payload
+            call_with_retry, "huggingface", get_http_client().post, HF_MODEL_URL, headers={"Authorization": f"Bearer {get_config().huggingface_api_key}"}, json=payload,
+            timeout=(5, 120), fail_if=lambda r: r.status_code == 429 or r.status_code >= 500
         )
         if response.status_code == 200:
             return response.content #if image successfully genrate hui  then it return binary content
         else:
             print(f"[ERROR] API Error ({response.status_code}): {response.text}")
             return None
+    except RetryError as e:
+        print(f"[ERROR] API Error ({e.last_result.status_code}): {e.last_result.text}")
+        return None
     except Exception as e:
         print(f"[EXCEPTION] During image fetch: {e}") # kisi ko bhi expect krke image return krega
         return None
 
 
-async def generate_images(prompt: str):
-    tasks = []
-    safe_prompt = sanitize_filename(prompt)
-
-    for i in range(IMAGE_COUNT):
+async def generate_images(prompt: str, on_progress=None):
+    """Fetch IMAGE_COUNT variants concurrently and save them to the image store;
+    returns the StoredImage handles. on_progress(finished, total) is called as
+    each variant comes back."""
+    async def fetch_variant(i):
         payload = {
             "inputs": f"{prompt}, ultra high definition, quality=4K, cinematic lighting, sharp, seed={randint(1, 1_000_000)}"  #hamne random no. isliye use kra hai bcz har aar image alag nikle hai
         }
-        tasks.append(asyncio.create_task(fetch_image(payload)))
-
-    results = await asyncio.gather(*tasks)# sab task comp. hone tk wait krega then  or result mai image dega
+        return i, await fetch_image(payload)
 
-    for i, img_bytes in enumerate(results):
-        if img_bytes:
-            file_path = os.path.join(DATA_DIR, f"{safe_prompt}_{i + 1}.jpg")
-            with open(file_path, "wb") as f:
-                f.write(img_bytes)
-            print(f"[SAVED] {file_path}")
-        else:
-            print(f"[SKIPPED] Image {i + 1} could not be fetched.")  #if image not found then it skip msg
+    tasks = [asyncio.create_task(fetch_variant(i)) for i in range(IMAGE_COUNT)]
+    saved = []
+    try:
+        # jo image pehle aaye wo pehle save ho, sab ka wait nahi
+        for finished, next_result in enumerate(asyncio.as_completed(tasks), start=1):
+            i, img_bytes = await next_result
+            stored = None
+            if img_bytes:
+                try:
+                    stored = await asyncio.to_thread(image_store.put, img_bytes, prompt)
+                except ValueError as e:
+                    print(f"[ERROR] Image {i + 1}: {e}")
+            if stored is not None:
+                saved.append(stored)
+                print(f"[SAVED] {stored.path}")
+            else:
+                print(f"[SKIPPED] Image {i + 1} could not be fetched.")  #if image not found then it skip msg
+            if on_progress is not None:
+                on_progress(finished, IMAGE_COUNT)
+    finally:
+        for task in tasks:
+            task.cancel()  # only matters when the job itself was cancelled
+    return saved
 
 
 def GenerateImages(prompt: str):
     print(f"\n[GENERATING] Prompt: {prompt}\n")
-    asyncio.run(generate_images(prompt))
-    open_images(prompt)
-
-
-# === Main Loop ===
-if __name__ == "__main__":
-    while True:
-        try:
-            if not os.path.exists(STATUS_FILE):
-                print("[WAITING] Status file not found. Retrying...")
-                sleep(2) #file nhi mili to 2 second wait krega
-                continue
-
-            with open(STATUS_FILE, "r") as f:
-                data = f.read().strip()
-
-            if not data or "," not in data:
-                sleep(1)
+    open_images(asyncio.run(generate_images(prompt)))
+
+
+# === Image generation service ===
+
+class ImageJob:
+    def __init__(self, prompt):
+        self.id = uuid.uuid4().hex[:8]
+        self.prompt = prompt
+        self.status = "queued"  # queued -> running -> done / failed / cancelled
+        self.progress = (0, IMAGE_COUNT)
+        self.images = []  # StoredImage handles, bytes stay in memory
+        self.files = []
+        self.error = None
+        self.created = time.time()
+        self.finished = None
+        self.show = True
+        self.task = None
+        self._done = threading.Event()
+
+    def wait(self, timeout=None) -> bool:
+        return self._done.wait(timeout)
+
+    def to_dict(self) -> dict:
+        return {"id": self.id, "prompt": self.prompt, "status": self.status,
+                "progress": list(self.progress), "files": list(self.files), "error": self.error}
+
+
+class ImageService:
+    """Long-lived image generator running on its own event loop thread.
+
+    submit() queues a job and returns at once; every state change is
+    published on the event bus as "image.job" (a to_dict() snapshot). Only
+    the last keep_finished finished jobs stay in jobs; callers that need the
+    images longer keep the ImageJob that submit() returned.
+    """
+
+    def __init__(self, concurrency=1, show_results=True, keep_finished=FINISHED_JOBS_KEPT):
+        self.concurrency = concurrency
+        self.show_results = show_results
+        self.keep_finished = keep_finished
+        self.jobs = {}  # insertion order, oldest first
+        self._loop = None
+        self._queue = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, daemon=True).start()
+                # the queue belongs to the service loop, whichever thread submits first
+                asyncio.run_coroutine_threadsafe(self._start_workers(), loop).result()
+                self._loop = loop
+            return self._loop
+
+    async def _start_workers(self):
+        self._queue = asyncio.Queue()
+        for _ in range(self.concurrency):
+            asyncio.ensure_future(self._worker())
+
+    def _publish(self, job):
+        bus.publish("image.job", job.to_dict())
+
+    def submit(self, prompt, show=None) -> ImageJob:
+        """Queue prompt; show=False skips opening the results in the image viewer."""
+        loop = self._ensure_started()
+        job = ImageJob(prompt)
+        job.show = self.show_results if show is None else show
+        with self._lock:
+            self.jobs[job.id] = job
+        self._publish(job)
+        loop.call_soon_threadsafe(self._queue.put_nowait, job)
+        return job
+
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id) -> bool:
+        job = self.jobs.get(job_id)
+        if job is None or job.status not in ("queued", "running"):
+            return False
+        if job.status == "queued":
+            self._finish(job, "cancelled")  # the worker skips it
+        else:
+            self._loop.call_soon_threadsafe(job.task.cancel)
+        return True
+
+    def _finish(self, job, status, error=None):
+        job.status = status
+        job.error = error
+        job.finished = time.time()
+        self._publish(job)
+        job._done.set()
+        self._prune()
+
+    def _prune(self):
+        with self._lock:
+            finished = [job_id for job_id, job in self.jobs.items() if job.finished is not None]
+            for job_id in finished[:max(0, len(finished) - self.keep_finished)]:
+                del self.jobs[job_id]
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            if job.status != "queued":
                 continue
+            job.task = asyncio.ensure_future(self._run(job))
+            try:
+                await job.task
+            except asyncio.CancelledError:
+                self._finish(job, "cancelled")
+            except Exception as e:
+                print(f"[EXCEPTION] Image job {job.id} failed: {e}")
+                self._finish(job, "failed", str(e))
+
+    async def _run(self, job):
+        job.status = "running"
+        self._publish(job)
+        bus.publish("status", "Generating images ...")
+
+        def on_progress(finished, total):
+            job.progress = (finished, total)
+            self._publish(job)
 
-            prompt, status = map(str.strip, data.split(",", 1))
+        try:
+            job.images = await generate_images(job.prompt, on_progress)
+            job.files = [stored.path for stored in job.images]
+        finally:
+            bus.publish("status", "Available ...")
+        if not job.files:
+            self._finish(job, "failed", "no image could be fetched")
+            return
+        self._finish(job, "done")
+        print(f"[DONE] Completed image generation for: {job.prompt} ({job.finished - job.created:.1f}s)")
+        if job.show:
+            await asyncio.to_thread(open_images, job.images)
 
-            if status.lower() == "true" and prompt:
-                GenerateImages(prompt)
+    def close(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
 
-                # Reset status
-                with open(STATUS_FILE, "w") as f:
-                    f.write("false,false")
 
-                print(f"[DONE] Completed image generation for: {prompt}")
-                break
+image_service = ImageService()
 
-            sleep(1)
 
-        except Exception as e:
-            print(f"[CRITICAL ERROR] {e}")
-            sleep(3)
+# === Command line ===
+if __name__ == "__main__":
+    import sys
+    prompt = " ".join(sys.argv[1:]) or input("Prompt: ")
+    job = image_service.submit(prompt)
+    try:
+        job.wait()
+    except KeyboardInterrupt:
+        image_service.cancel(job.id)
+        job.wait(5)
+    print(job.to_dict())
@@ -0,0 +1,109 @@
+"""
+Content-addressed store for generated images.
+
+    image = image_store.put(raw_bytes, prompt="a red fox")
+    image.path        # Data/Images/3fa4c1d2e5b6a7f8.png, named by SHA-256
+    image.data        # the bytes, kept in memory for the GUI / Streamlit
+    image.image()     # PIL image decoded from memory, no disk read
+
+Files are named by the hash of their bytes, so identical results are stored
+once and two generations of the same prompt never overwrite each other. The
+extension comes from the file's magic bytes rather than being assumed to be
+.jpg. Thumbnails are written by a background thread.
+"""
+
+import io
+import os
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+IMAGE_DIR = os.path.join("Data", "Images")
+THUMBNAIL_SIZE = (256, 256)
+
+# (magic bytes at offset 0, extension); WEBP is checked separately
+SIGNATURES = [
+    (b"\xff\xd8\xff", "jpg"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+    (b"BM", "bmp"),
+]
+
+
+def DetectFormat(data: bytes):
+    """File extension for the image bytes, or None if they are not an image."""
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    for magic, extension in SIGNATURES:
+        if data.startswith(magic):
+            return extension
+    return None
+
+
+class StoredImage:
+    def __init__(self, digest, extension, path, data, prompt=None):
+        self.digest = digest
+        self.extension = extension
+        self.path = path
+        self.data = data
+        self.prompt = prompt
+        self.thumbnail_path = None
+        self.thumbnail_ready = threading.Event()
+
+    def image(self):
+        from PIL import Image
+        return Image.open(io.BytesIO(self.data))
+
+    def __repr__(self):
+        return f"StoredImage({self.path!r})"
+
+
+class ImageStore:
+    def __init__(self, directory=IMAGE_DIR, thumbnail_size=THUMBNAIL_SIZE):
+        self.directory = directory
+        self.thumbnail_dir = os.path.join(directory, "thumbs")
+        self.thumbnail_size = thumbnail_size
+        self._lock = threading.Lock()
+        self._thumbnailer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="thumbnails")
+        self.stats = {"stored": 0, "duplicates": 0}
+
+    def put(self, data: bytes, prompt=None) -> StoredImage:
+        extension = DetectFormat(data)
+        if extension is None:
+            raise ValueError("Not a recognised image format")
+        digest = hashlib.sha256(data).hexdigest()
+        path = os.path.join(self.directory, f"{digest[:16]}.{extension}")
+        stored = StoredImage(digest, extension, path, data, prompt)
+
+        with self._lock:
+            duplicate = os.path.exists(path)
+            self.stats["duplicates" if duplicate else "stored"] += 1
+        if not duplicate:
+            os.makedirs(self.directory, exist_ok=True)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)  # readers never see a half-written file
+        self._thumbnailer.submit(self._write_thumbnail, stored)
+        return stored
+
+    def _write_thumbnail(self, stored):
+        thumbnail_path = os.path.join(self.thumbnail_dir, f"{stored.digest[:16]}.jpg")
+        try:
+            if not os.path.exists(thumbnail_path):
+                os.makedirs(self.thumbnail_dir, exist_ok=True)
+                img = stored.image()
+                img.thumbnail(self.thumbnail_size)
+                img.convert("RGB").save(thumbnail_path, "JPEG", quality=85)
+            stored.thumbnail_path = thumbnail_path
+        except Exception as e:
+            print(f"[ERROR] Thumbnail for {stored.path} failed: {e}")
+        finally:
+            stored.thumbnail_ready.set()
+
+    def close(self):
+        self._thumbnailer.shutdown(wait=True)
+
+
+image_store = ImageStore()
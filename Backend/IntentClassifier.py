@@ -0,0 +1,229 @@
+"""
+Offline fast path for FirstLayerDMM.
+
+Commands such as "open chrome", "volume up" or "play let her go" map
+deterministically to one of the `funcs` prefixes in Backend/Model.py, so they
+are classified here with compiled rules instead of a Cohere round-trip. The
+query is split into parts on commas / "and" / "then"; every part must match a
+rule, and the lowest rule confidence decides whether the result is trusted or
+the query goes to the LLM.
+
+Run `python -m Backend.IntentClassifier` to benchmark the rules against the
+labelled corpus below (add --llm to compare with the Cohere path).
+"""
+
+import re
+import sys
+import time
+
+DEFAULT_THRESHOLD = 0.8
+CARRY_OVER_CONFIDENCE = 0.7  # "open chrome and firefox" -> second verb is guessed
+
+SPLIT_PATTERN = re.compile(r"\s*,\s*|\s+(?:and then|and|then)\s+")
+# "open up about", "close your eyes", "open a conversation": chat, not an app name
+NOT_AN_APP = r"(?!(?:up|a|an|me|my|your|yourself|the door)\b)"
+
+
+class Rule:
+    """Compiled pattern that turns one query part into one decision."""
+
+    def __init__(self, pattern, template, confidence, keywords=()):
+        self.regex = re.compile(pattern)
+        self.template = template
+        self.confidence = confidence
+        # first words that can start a match; empty means "try for every part"
+        self.keywords = keywords
+
+    def match(self, text):
+        m = self.regex.fullmatch(text)
+        if m is None:
+            return None
+        return self.template.format(*[g.strip() for g in m.groups()], text=text)
+
+
+DEFAULT_RULES = [
+    Rule(r"(?:bye|goodbye|good bye)(?: \w+)?|exit|quit", "exit", 0.9,
+         ("bye", "goodbye", "good", "exit", "quit")),
+    Rule(r"(?:please )?(mute|unmute|volume up|volume down)", "system {0}", 0.95,
+         ("please", "mute", "unmute", "volume")),
+    Rule(r"(?:turn|increase|raise) (?:the )?volume(?: up)?", "system volume up", 0.9,
+         ("turn", "increase", "raise")),
+    Rule(r"(?:decrease|lower|reduce) (?:the )?volume", "system volume down", 0.9,
+         ("decrease", "lower", "reduce")),
+    # "start over", "kill some time" are chat, so only the unambiguous verbs are fast-pathed
+    Rule(r"(?:please )?(?:open|launch) " + NOT_AN_APP + r"(.+)", "open {0}", 0.95,
+         ("please", "open", "launch")),
+    Rule(r"(?:please )?close " + NOT_AN_APP + r"(.+)", "close {0}", 0.95,
+         ("please", "close")),
+    Rule(r"(?:please )?play (?!.*\bwith me\b)(.+?)(?: on youtube)?", "play {0}", 0.9,
+         ("please", "play")),
+    Rule(r"youtube search (.+)", "youtube search {0}", 0.95, ("youtube",)),
+    Rule(r"search youtube for (.+)", "youtube search {0}", 0.95, ("search",)),
+    Rule(r"search (?:for )?(.+?) on youtube", "youtube search {0}", 0.9, ("search",)),
+    Rule(r"google search (.+)", "google search {0}", 0.95, ("google",)),
+    Rule(r"search google for (.+)", "google search {0}", 0.9, ("search",)),
+    Rule(r"search (?:for )?(.+?) on google", "google search {0}", 0.9, ("search",)),
+    Rule(r"(?:generate|create|draw) (?:an? )?(?:image|picture|photo)s? ((?:of|showing) .+)",
+         "generate image {0}", 0.95, ("generate", "create", "draw")),
+    Rule(r"(?:write|draft) (?:me )?(?:an? )?((?:application|letter|email|essay|poem|code|song|story)\b.*)",
+         "content {0}", 0.85, ("write", "draft")),
+    Rule(r"what(?:'s| is) the (?:time|date|day)(?: today)?(?: now)?", "general {text}?", 0.9,
+         ("what", "what's")),
+    Rule(r"what(?:'s| is) today'?s? (?:date|day)", "general {text}?", 0.9, ("what", "what's")),
+]
+
+
+class IntentClassifier:
+    """Rule-based classifier returning FirstLayerDMM-style decision lists."""
+
+    def __init__(self, rules=None, threshold=DEFAULT_THRESHOLD):
+        self.rules = list(DEFAULT_RULES if rules is None else rules)
+        self.threshold = threshold
+        self._by_keyword = {}
+        self._anywhere = []
+        for rule in self.rules:
+            if rule.keywords:
+                for keyword in rule.keywords:
+                    self._by_keyword.setdefault(keyword, []).append(rule)
+            else:
+                self._anywhere.append(rule)
+
+    def _candidates(self, part):
+        first_word = part.split(" ", 1)[0]
+        return self._by_keyword.get(first_word, []) + self._anywhere
+
+    def _classify_part(self, part):
+        for rule in self._candidates(part):
+            decision = rule.match(part)
+            if decision is not None:
+                return decision, rule.confidence
+        return None, 0.0
+
+    def classify_with_confidence(self, query: str):
+        """Return (decisions, confidence); decisions is [] when nothing matched."""
+        text = re.sub(r"\s+", " ", query.lower()).strip().rstrip(".?!").strip()
+        if not text:
+            return [], 0.0
+        decisions = []
+        confidence = 1.0
+        previous_verb = None
+        for part in SPLIT_PATTERN.split(text):
+            if not part:
+                continue
+            decision, part_confidence = self._classify_part(part)
+            if decision is None and previous_verb is not None:
+                # "open chrome and firefox": reuse the verb of the previous part
+                decision, part_confidence = f"{previous_verb} {part}", CARRY_OVER_CONFIDENCE
+            if decision is None:
+                return [], 0.0
+            if decision.startswith(("open ", "close ", "play ")):
+                previous_verb = decision.split(" ", 1)[0]
+            else:
+                previous_verb = None
+            decisions.append(decision)
+            confidence = min(confidence, part_confidence)
+        return decisions, confidence
+
+    def classify(self, query: str, threshold=None):
+        """Decision list if every part is confidently matched, otherwise None."""
+        decisions, confidence = self.classify_with_confidence(query)
+        if decisions and confidence >= (self.threshold if threshold is None else threshold):
+            return decisions
+        return None
+
+
+# Labelled corpus: query -> decision list FirstLayerDMM is expected to return
+LABELLED_CORPUS = [
+    ("open chrome", ["open chrome"]),
+    ("Open notepad.", ["open notepad"]),
+    ("open chrome and firefox", ["open chrome", "open firefox"]),
+    ("open facebook, open instagram", ["open facebook", "open instagram"]),
+    ("open telegram and close whatsapp", ["open telegram", "close whatsapp"]),
+    ("close notepad", ["close notepad"]),
+    ("close spotify.", ["close spotify"]),
+    ("play let her go", ["play let her go"]),
+    ("play afsanay by ys", ["play afsanay by ys"]),
+    ("mute", ["system mute"]),
+    ("unmute.", ["system unmute"]),
+    ("volume up", ["system volume up"]),
+    ("volume down and open chrome", ["system volume down", "open chrome"]),
+    ("increase the volume", ["system volume up"]),
+    ("youtube search python automation", ["youtube search python automation"]),
+    ("search lofi music on youtube", ["youtube search lofi music"]),
+    ("google search elon musk", ["google search elon musk"]),
+    ("search google for cheap flights", ["google search cheap flights"]),
+    ("generate image of a lion", ["generate image of a lion"]),
+    ("create an image of a cat in space", ["generate image of a cat in space"]),
+    ("write an application for sick leave", ["content application for sick leave"]),
+    ("write me a letter to my landlord", ["content letter to my landlord"]),
+    ("what's the time?", ["general what's the time?"]),
+    ("what is the date today", ["general what is the date today?"]),
+    ("bye jarvis.", ["exit"]),
+    ("goodbye", ["exit"]),
+    ("who was akbar?", ["general who was akbar?"]),
+    ("how can i study more effectively?", ["general how can i study more effectively?"]),
+    ("who is indian prime minister", ["realtime who is indian prime minister"]),
+    ("what is today's news?", ["realtime what is today's news?"]),
+    ("tell me about facebook's recent update.", ["realtime tell me about facebook's recent update."]),
+    ("open chrome and tell me about mahatma gandhi.", ["open chrome", "general tell me about mahatma gandhi."]),
+    ("set a reminder at 9:00pm on 25th june for my business meeting.",
+     ["reminder 9:00pm 25th june business meeting"]),
+    ("thanks, i really liked it.", ["general thanks, i really liked it."]),
+    # near misses: command verbs in ordinary chat must not take the fast path
+    ("start a conversation with me", ["general start a conversation with me"]),
+    ("start over", ["general start over"]),
+    ("kill some time with me", ["general kill some time with me"]),
+    ("make a picture of my day better", ["general make a picture of my day better"]),
+    ("create a photo album", ["general create a photo album"]),
+    ("google is a company?", ["general google is a company?"]),
+    ("play a game with me", ["general play a game with me"]),
+    ("i watched it on youtube yesterday", ["general i watched it on youtube yesterday"]),
+    ("open up about your day", ["general open up about your day"]),
+    ("close your eyes and relax", ["general close your eyes and relax"]),
+    ("what did you find on google?", ["general what did you find on google?"]),
+    ("draw me into the story", ["general draw me into the story"]),
+]
+
+
+def _normalise_decisions(decisions):
+    return [re.sub(r"\s+", " ", d.lower()).strip().rstrip(".?!") for d in decisions]
+
+
+def benchmark(classifier=None, llm=None, corpus=LABELLED_CORPUS):
+    """Accuracy and latency of the fast path (and optionally the LLM path)."""
+    classifier = classifier or IntentClassifier()
+    report = {}
+    paths = [("fast path", classifier.classify)]
+    if llm is not None:
+        paths.append(("llm", llm))
+    for name, decide in paths:
+        handled = correct = 0
+        latencies = []
+        for query, expected in corpus:
+            start = time.perf_counter()
+            decisions = decide(query)
+            latencies.append(time.perf_counter() - start)
+            if decisions is None:
+                continue
+            handled += 1
+            if _normalise_decisions(decisions) == _normalise_decisions(expected):
+                correct += 1
+        latencies.sort()
+        report[name] = {
+            "coverage": handled / len(corpus),
+            "accuracy": correct / handled if handled else 0.0,
+            "wrong": handled - correct,  # answered by this path but not what was expected
+            "mean_ms": 1000 * sum(latencies) / len(latencies),
+            "p95_ms": 1000 * latencies[int(0.95 * (len(latencies) - 1))],
+        }
+    return report
+
+
+if __name__ == "__main__":
+    llm = None
+    if "--llm" in sys.argv:
+        from Backend.Model import CohereDMM
+        llm = CohereDMM
+    for name, row in benchmark(llm=llm).items():
+        print(f"{name:>10}: coverage {row['coverage']:.0%}, accuracy {row['accuracy']:.0%} ({row['wrong']} wrong), "
+              f"mean {row['mean_ms']:.3f} ms, p95 {row['p95_ms']:.3f} ms")
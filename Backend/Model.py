@@ -1,13 +1,19 @@
-import cohere
+import re
 from rich import print
-from dotenv import dotenv_values
+from Backend.Cache import TTLCache, CACHE_DB_PATH
+from Backend.IntentClassifier import IntentClassifier, DEFAULT_THRESHOLD
+from Backend.Retry import call_with_retry, retry_metrics
+from Backend.Config import get_config, cohere_client
 
-# Load environment variables
-env_vars = dotenv_values('.env')
-CohereAPIKey = env_vars.get("CohereAPIKey")
+config = get_config()
 
-# Initialize Cohere client
-co = cohere.Client(api_key=CohereAPIKey)
+# Decision cache: repeated commands ("open chrome", "volume up") skip the Cohere round-trip
+DecisionCacheTTL = config.int("DecisionCacheTTL", 7 * 24 * 3600)
+decision_cache = TTLCache(maxsize=512, ttl=DecisionCacheTTL, path=CACHE_DB_PATH, namespace="decisions")
+
+# Offline fast path: clear-cut commands are classified locally, the rest go to Cohere
+FastPathThreshold = config.float("FastPathThreshold", DEFAULT_THRESHOLD)
+fast_path = IntentClassifier(threshold=FastPathThreshold)
 
 # Define valid function types i,e which task  is it like which query is it
 funcs = [
@@ -55,13 +61,19 @@ ChatHistory = [
     {"role": "Chatbot", "message": "general chat with me."}
 ]
 
-# Main decision function
+# QueryModifier jaisa hi normalise karta hai taaki "Open chrome." aur "open chrome" ek hi cache key bane
+def NormaliseQuery(prompt: str) -> str:
+    return re.sub(r"\s+", " ", prompt.lower()).strip().rstrip(".?!").strip()
 
-def FirstLayerDMM(prompt: str = "test"):
+FallbackDecision = ["general (query)"]
+
+# Cohere wala decision path (cache aur fast path ke bina)
+def CohereDMM(prompt: str = "test"):
     messages.append({"role": "user", "content": prompt}) # is prompt se yie json mai store hoga
-#start a streaming chat with coheere model using all context and premable 
-    try:
-        stream = co.chat_stream(
+
+    #start a streaming chat with coheere model using all context and premable 
+    def ask():
+        stream = cohere_client().chat_stream(
             model="command-r-plus", #using cohere command R+ model
             message=prompt, 
             temperature=0.7,
@@ -70,26 +82,40 @@ def FirstLayerDMM(prompt: str = "test"):
             connectors=[],
             preamble=preamble
         )
-    except Exception as e:
-        print(f"[red]Error connecting to Cohere API:[/red] {e}")
-        return ["general (query)"]
 
-    response = ""#empty string
+        response = ""#empty string
 
-    for event in stream:
-        if event.event_type == "text-generation":
-            response += event.text # it add text in response event string
+        for event in stream:
+            if event.event_type == "text-generation":
+                response += event.text # it add text in response event string
 
-    response = response.replace("\n", "").split(",") #clear the unusual spaces comma
-    response = [i.strip() for i in response if i.strip()]
+        response = response.replace("\n", "").split(",") #clear the unusual spaces comma
+        response = [i.strip() for i in response if i.strip()]
+
+        return [task for task in response if any(task.startswith(func) for func in funcs)] 
+
+    # If the model is unsure and gives "query", ask again (bounded retries with backoff, no recursion)
+    try:
+        return call_with_retry("cohere", ask, retry_if=lambda temp: "query" in temp)
+    except Exception as e:
+        print(f"[red]Error getting a decision from Cohere API:[/red] {e}")
+        return list(FallbackDecision)
+
+# Main decision function: cache -> local fast path -> Cohere
+def FirstLayerDMM(prompt: str = "test"):
+    cache_key = NormaliseQuery(prompt)
+    cached = decision_cache.get(cache_key)
+    if cached is not None:
+        return list(cached)
 
-    temp = [task for task in response if any(task.startswith(func) for func in funcs)] 
+    decision = fast_path.classify(prompt)
+    if decision is not None:
+        return decision
 
-  # If the model is unsure and gives "query", call itself again (try again recursively)
-    if "query" in temp:
-        return FirstLayerDMM(prompt=prompt)
-    else:
-        return temp
+    decision = CohereDMM(prompt)
+    if decision and decision != FallbackDecision:
+        decision_cache.set(cache_key, decision)
+    return decision
 
 # CLI testing like it is infinite loop jo input accept kr skta hai command line mai
 if __name__ == "__main__":
@@ -100,4 +126,6 @@ if __name__ == "__main__":
                 result = FirstLayerDMM(user_input)
                 print(f"[green]Decision:[/green] {result}")
     except KeyboardInterrupt:
+        print(f"\n[cyan]Decision cache:[/cyan] {decision_cache.stats()}")
+        print(f"[cyan]Retries:[/cyan] {retry_metrics()}")
         print("\n[bold red]Session ended by user.[/bold red]")
@@ -1,23 +1,24 @@
 from googlesearch import search
-import google.generativeai as genai
-from json import load, dump
 import datetime
-from dotenv import dotenv_values
-import os
-import requests  # Add this import for weather API
+import re
+import threading
+from Backend.Sessions import default_conversation
+from Backend.Cache import TTLCache, CACHE_DB_PATH
+from Backend.HTTP import get_http_client
+from Backend.ContextWindow import ContextWindow, model_summariser
+from Backend.Retry import stream_with_retry
+from Backend.Config import get_config, gemini_model
 
-# Load environment variables
-env_vars = dotenv_values(".env")  #able to access .env file
+config = get_config()
+Username = config.username
+Assistantname = config.assistantname
 
-Username = env_vars.get("Username")
-Assistantname = env_vars.get("Assistantname")
-GeminiAPIKey = env_vars.get("GeminiAPIKey")
-# Add OpenWeatherMap API key to your .env file as WeatherAPIKey=your_api_key
-WeatherAPIKey = env_vars.get("WeatherAPIKey")
-
-# Initialize Gemini client
-genai.configure(api_key=GeminiAPIKey)
-model = genai.GenerativeModel('gemini-pro')
+# Search results take part of the prompt, so the history budget is smaller than ChatBot's
+def NewContextWindow():
+    return ContextWindow(
+        budget_tokens=config.int("RealtimeContextTokens", 2000),
+        summariser=model_summariser() if config.bool("SummariseHistory") else None,
+    )
 
 System = f"""  
 Hello, I am {Username}, You are a very accurate and advanced AI chatbot named {Assistantname} which has real-time up-to-date information from the internet.
@@ -25,45 +26,107 @@ Hello, I am {Username}, You are a very accurate and advanced AI chatbot named {A
 *** Just answer the question from the provided data in a professional way. ***
 """#train llm modle
 
-# Ensure ChatLog file exists i,e . command is store in json
-chatlog_path = "Data/ChatLog.json"  
-os.makedirs(os.path.dirname(chatlog_path), exist_ok=True)
-if not os.path.isfile(chatlog_path):
-    with open(chatlog_path, "w") as f:
-        dump([], f)
+# Search cache: repeated questions ("today's news", "who is the prime minister")
+# skip the Google scrape. News-like queries expire fast, facts last longer, and
+# for a while after expiry the old results are served while a refresh runs.
+SEARCH_TTLS = {
+    "news": config.int("SearchNewsTTL", 15 * 60),
+    "fact": config.int("SearchFactTTL", 24 * 3600),
+    "default": config.int("SearchCacheTTL", 3 * 3600),
+}
+NEWS_WORDS = {"news", "latest", "today", "today's", "headline", "headlines", "live", "score",
+              "price", "stock", "now", "current", "currently", "recent", "update", "tonight"}
+FACT_PREFIXES = ("who is", "who was", "what is", "what was", "where is", "when was", "when did", "how old is")
+FILLER_WORDS = {"please", "tell", "me", "about", "can", "you", "could", "search", "google", "for"}
+
+search_cache = TTLCache(maxsize=256, ttl=SEARCH_TTLS["default"], path=CACHE_DB_PATH,
+                        namespace="search", stale_ttl=config.int("SearchStaleTTL", 3600))
+
+def NormaliseSearchQuery(query):
+    words = re.sub(r"[^\w\s']", " ", query.lower()).split()
+    kept = [word for word in words if word not in FILLER_WORDS]
+    return " ".join(kept or words)
+
+def SearchQueryClass(query):
+    normalised = re.sub(r"[^\w\s']", " ", query.lower())
+    if NEWS_WORDS.intersection(normalised.split()):
+        return "news"
+    if normalised.strip().startswith(FACT_PREFIXES):
+        return "fact"
+    return "default"
+
+def _google_search(query):
+    results = list(search(query, advanced=True, num_results=5))
+    if not results:
+        raise RuntimeError("no results (possibly rate limited)")
+    output = f"The search results for '{query}' are:\n[start]\n"
+    for i in results:
+        output += f"Title: {i.title}\nDescription: {i.description}\n\n"
+    output += "[end]"
+    return output
 
 # Google Search abstraction
 def GoogleSearch(query):
     try:
-        results = list(search(query, advanced=True, num_results=5))
-        output = f"The search results for '{query}' are:\n[start]\n"
-        for i in results:
-            output += f"Title: {i.title}\nDescription: {i.description}\n\n"
-        output += "[end]"
-        return output
+        return search_cache.get_or_load(
+            NormaliseSearchQuery(query), lambda: _google_search(query),
+            ttl=SEARCH_TTLS[SearchQueryClass(query)],
+        )
     except Exception as e:
+        # failures are not cached, the next call scrapes again
         return f"[start]\nSearch failed for '{query}': {str(e)}\n[end]"
 
+# Weather: the IP location is looked up once per process, city weather is cached
+# briefly and both go over the shared keep-alive HTTP client. The URLs can point at a local
+# stub server (see Backend/WeatherStub.py) to check the caching offline.
+IPInfoURL = config.get("IPInfoURL", "https://ipinfo.io/json")
+WeatherAPIURL = config.get("WeatherAPIURL", "https://api.openweathermap.org/data/2.5/weather")
+weather_cache = TTLCache(maxsize=64, ttl=config.int("WeatherCacheTTL", 600), namespace="weather")
+_detected_city = None
+_detected_city_lock = threading.Lock()
+
+def DetectCity():
+    """City of the machine's public IP; only a successful lookup is memoised."""
+    global _detected_city
+    with _detected_city_lock:
+        if _detected_city is None:
+            try:
+                ip_response = get_http_client().get(IPInfoURL, timeout=5)
+                if ip_response.status_code == 200:
+                    _detected_city = ip_response.json().get('city')
+            except Exception as e:
+                print(f"[WARN] IP location lookup failed: {e}")
+        return _detected_city or 'London'  # Default to London if cannot detect
+
+def FetchWeather(city_name):
+    """Raw OpenWeatherMap data for city_name, cached for WeatherCacheTTL seconds."""
+    key = city_name.strip().lower()
+    data = weather_cache.get(key)
+    if data is None:
+        response = get_http_client().get(
+            WeatherAPIURL, params={"q": city_name, "appid": get_config().weather_api_key, "units": "metric"}, timeout=10
+        )
+        if response.status_code != 200:
+            return None  # errors are not cached
+        data = response.json()
+        weather_cache.set(key, data)
+    return data
+
 # Weather information function
 def GetWeather(city_name=None):
-    if not WeatherAPIKey:
+    # Add OpenWeatherMap API key to your .env file as WeatherAPIKey=your_api_key
+    if not get_config().weather_api_key:
         return "Weather API key not configured. Please add WeatherAPIKey to your .env file."
     
     try:
         if not city_name:
             # Try to get location from IP if no city specified
-            ip_response = requests.get('https://ipinfo.io')
-            if ip_response.status_code == 200:
-                city_name = ip_response.json().get('city', 'London')  # Default to London if cannot detect
-            else:
-                city_name = 'London'
+            city_name = DetectCity()
         
         # Get weather data
-        weather_url = f"http://api.openweathermap.org/data/2.5/weather?q={city_name}&appid={WeatherAPIKey}&units=metric"
-        response = requests.get(weather_url)
+        data = FetchWeather(city_name)
         
-        if response.status_code == 200:
-            data = response.json()
+        if data is not None:
             weather_info = (
                 f"Weather in {data['name']}, {data['sys']['country']}:\n"
                 f"Temperature: {data['main']['temp']}°C (feels like {data['main']['feels_like']}°C)\n"
@@ -82,13 +145,6 @@ def GetWeather(city_name=None):
 def AnswerModifier(Answer):
     return '\n'.join([line for line in Answer.split('\n') if line.strip()]) # it modify answer and question 
 
-# Initial system messages i,e it store in form of that
-SystemChatBot = [
-    {"role": "system", "content": System},
-    {"role": "user", "content": "Hi"},
-    {"role": "assistant", "content": "Hello, how can I help you?"}
-]
-
 # Real-time system info
 def Information():
     now = datetime.datetime.now()
@@ -101,86 +157,100 @@ def Information():
         f"Time: {now.strftime('%H')} hours, {now.strftime('%M')} minutes, {now.strftime('%S')} seconds."
     )
 
-# Primary processing logic
-def RealtimeSearchEngine(prompt):
-    global SystemChatBot, messages
+WEATHER_TRIGGER_WORDS = ('weather', 'temperature', 'forecast', 'humid', 'rain', 'sunny', 'cloudy')
 
-    # Load chat history
-    with open(chatlog_path, "r") as f:
-        messages = load(f)
 
-    messages.append({"role": "user", "content": prompt})
+def WeatherCity(prompt):
+    """City named in a weather question, or None (then it is detected from the IP)."""
+    # Simple approach to extract city name - can be improved
+    words = prompt.split()
+    for i, word in enumerate(words):
+        if word.lower() in ['in', 'at', 'for', 'of'] and i+1 < len(words):
+            return words[i+1].strip('.,!?')
+    # If no preposition found, try to find a proper noun (capitalized word)
+    for word in words:
+        if word.istitle() and word.lower() not in WEATHER_TRIGGER_WORDS:
+            return word
+    return None
 
-    # Check if the prompt is asking for weather information
-    weather_trigger_words = ['weather', 'temperature', 'forecast', 'humid', 'rain', 'sunny', 'cloudy']
-    is_weather_query = any(word in prompt.lower() for word in weather_trigger_words)
-    
-    # Extract city name if mentioned
-    city_name = None
-    if is_weather_query:
-        # Simple approach to extract city name - can be improved
-        words = prompt.split()
-        for i, word in enumerate(words):
-            if word.lower() in ['in', 'at', 'for', 'of'] and i+1 < len(words):
-                city_name = words[i+1].strip('.,!?')
-                break
-        
-        # If no preposition found, try to find a proper noun (capitalized word)
-        if not city_name:
-            for word in words:
-                if word.istitle() and word.lower() not in weather_trigger_words:
-                    city_name = word
-                    break
 
-    # Inject appropriate data based on query type
-    if is_weather_query:
-        SystemChatBot.append({"role": "system", "content": GetWeather(city_name)})
-    else:
-        SystemChatBot.append({"role": "system", "content": GoogleSearch(prompt)})
+class RealtimeSearchRequest:
+    """Everything one realtime answer needs, owned by that request alone.
 
-    try:
-        # Build conversation for Gemini
-        conversation_text = System + "\n" + Information() + "\n\n"
-        
-        # Add injected data (weather or search results)
-        if SystemChatBot and len(SystemChatBot) > 3:
-            conversation_text += SystemChatBot[-1]["content"] + "\n\n"
-        
-        # Add chat history
-        for msg in messages:
-            role = "User" if msg["role"] == "user" else "Assistant"
-            conversation_text += f"{role}: {msg['content']}\n"
-        
-        # Generate response with Gemini
-        response = model.generate_content(
-            conversation_text,
-            generation_config=genai.types.GenerationConfig(
-                max_output_tokens=2048,
-                temperature=0.7,
-            ),
-            stream=True
+    The injected search / weather data, the prompt text and the messages to
+    save live on the instance, and the module keeps no per-request state, so
+    any number of requests can stream at once from threads or asyncio tasks.
+    model defaults to the shared Gemini model; the stress test passes a fake.
+    """
+
+    def __init__(self, prompt, search_results=None, conversation=None, model=None):
+        self.prompt = prompt
+        self.search_results = search_results
+        self.conversation = conversation or default_conversation()
+        self.model = model
+        self.is_weather_query = any(word in prompt.lower() for word in WEATHER_TRIGGER_WORDS)
+        self.injected = None
+        self.answer = ""
+
+    def fetch(self):
+        """Weather or search data for the prompt (the prefetched results if given)."""
+        if self.injected is None:
+            if self.is_weather_query:
+                self.injected = GetWeather(WeatherCity(self.prompt))
+            else:
+                self.injected = self.search_results or GoogleSearch(self.prompt)
+        return self.injected
+
+    def build_prompt(self):
+        context_window = self.conversation.window("realtime", NewContextWindow)
+        # Add the recent chat history that fits the token budget
+        context_window.sync(self.conversation.log)
+        return (
+            System + "\n" + Information() + "\n\n"
+            + self.fetch() + "\n\n"
+            + context_window.text() + f"User: {self.prompt}\n"
         )
 
-        Answer = ""
-        for chunk in response:
-            if chunk.text:
-                Answer += chunk.text
+    def stream(self):
+        """Yield the answer chunk by chunk; the turn is saved once the stream ends."""
+        try:
+            conversation_text = self.build_prompt()
+
+            # Generate response with Gemini
+            def open_stream():
+                response = (self.model or gemini_model()).generate_content(
+                    conversation_text,
+                    generation_config={"max_output_tokens": 2048, "temperature": 0.7},
+                    stream=True
+                )
+                return (chunk.text for chunk in response if chunk.text)
 
-        Answer = Answer.strip()
-        messages.append({"role": "assistant", "content": Answer})
+            for chunk in stream_with_retry("gemini", open_stream):
+                self.answer += chunk
+                yield chunk
 
-        with open(chatlog_path, "w") as f:
-            dump(messages, f, indent=4)
+        except Exception as e:
+            if not self.answer:
+                yield f"[ERROR] Failed to generate response: {str(e)}"
+                return
 
-        return AnswerModifier(Answer)
+        self.conversation.log.extend([
+            {"role": "user", "content": self.prompt},
+            {"role": "assistant", "content": self.answer.strip()},
+        ])
+
+
+# Primary processing logic
+def RealtimeSearchEngineStream(prompt, search_results=None, conversation=None):
+    """Yield the answer chunk by chunk as Gemini produces it; the turn is
+    saved to the conversation's chat log (the shared one by default) once
+    the stream ends. search_results, when given, is a GoogleSearch() result
+    fetched ahead of time and skips the search."""
+    yield from RealtimeSearchRequest(prompt, search_results, conversation).stream()
 
-    except Exception as e:
-        return f"[ERROR] Failed to generate response: {str(e)}"
 
-    finally:
-        # Remove the last system message regardless of its content
-        if SystemChatBot and len(SystemChatBot) > 3:  # Keep the initial 3 messages
-            SystemChatBot.pop()
+def RealtimeSearchEngine(prompt, search_results=None, conversation=None):
+    return AnswerModifier("".join(RealtimeSearchEngineStream(prompt, search_results, conversation)))
 
 # CLI Entry point
 if __name__ == "__main__":
@@ -191,8 +261,10 @@ if __name__ == "__main__":
             prompt = input("\nYou: ").strip()
             if not prompt:
                 continue
-            response = RealtimeSearchEngine(prompt)
-            print(f"\n{Assistantname}: {response}")
+            print(f"\n{Assistantname}: ", end="", flush=True)
+            for chunk in RealtimeSearchEngineStream(prompt):
+                print(chunk, end="", flush=True)
+            print()
         except KeyboardInterrupt:
             print("\nSession ended.")
             break
\ No newline at end of file
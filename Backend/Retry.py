@@ -0,0 +1,189 @@
+"""
+Bounded retries with exponential backoff, jitter, per-request deadlines and
+a circuit breaker per upstream provider (cohere, gemini, huggingface).
+
+    answer = call_with_retry("gemini", generate, prompt)
+    for chunk in stream_with_retry("gemini", open_stream, prompt):
+        ...
+
+Retries stop after policy.max_attempts, or earlier when the next backoff
+would overrun the deadline. A provider that keeps failing opens its breaker
+and further calls fail fast with CircuitOpenError until reset_timeout has
+passed. Counters and breaker states are available from retry_metrics().
+"""
+
+import time
+import random
+import threading
+
+
+class CircuitOpenError(Exception):
+    """The provider's circuit breaker is open; the call was not attempted."""
+
+
+class DeadlineExceeded(Exception):
+    """The request deadline ran out before another attempt could be made."""
+
+
+class RetryError(Exception):
+    """Every attempt returned a result rejected by retry_if."""
+
+    def __init__(self, message, last_result=None):
+        super().__init__(message)
+        self.last_result = last_result
+
+
+class RetryPolicy:
+    def __init__(self, max_attempts=3, base_delay=0.5, max_delay=8.0, jitter=0.5, deadline=None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter  # fraction of the backoff that is randomised
+        self.deadline = deadline  # seconds for the whole call, None = no limit
+
+    def backoff(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(delay * (1 - self.jitter), delay)
+
+
+class CircuitBreaker:
+    """Opens after failure_threshold consecutive failures, lets one trial call
+    through after reset_timeout seconds (half-open) and closes on success."""
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                return True
+            return self.state == "closed"
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+
+POLICIES = {
+    "cohere": RetryPolicy(max_attempts=3, base_delay=0.5, deadline=20),
+    "gemini": RetryPolicy(max_attempts=3, base_delay=1.0, deadline=60),
+    "huggingface": RetryPolicy(max_attempts=4, base_delay=2.0, max_delay=15.0, deadline=120),
+}
+
+_EMPTY = object()
+_breakers = {}
+_metrics = {}
+_lock = threading.Lock()
+
+
+def get_breaker(provider: str) -> CircuitBreaker:
+    with _lock:
+        if provider not in _breakers:
+            _breakers[provider] = CircuitBreaker()
+        return _breakers[provider]
+
+
+def _count(provider, name):
+    with _lock:
+        counters = _metrics.setdefault(provider, {
+            "calls": 0, "attempts": 0, "successes": 0, "failures": 0,
+            "retries": 0, "rejected": 0, "deadline_exceeded": 0,
+        })
+        counters[name] += 1
+
+
+def call_with_retry(provider, fn, *args, policy=None, retry_if=None, fail_if=None, **kwargs):
+    """Call fn(*args, **kwargs) under provider's retry policy and breaker.
+
+    retry_if(result) -> True marks a returned result as unusable (e.g. the
+    model answered with a placeholder); such results are retried but do not
+    count against the breaker. fail_if(result) -> True marks a result that
+    reports a provider failure (e.g. an HTTP 429 / 5xx response); it is
+    retried and counted against the breaker like an exception. The deadline
+    is only checked between attempts.
+    """
+    policy = policy or POLICIES.get(provider) or RetryPolicy()
+    breaker = get_breaker(provider)
+    deadline = time.monotonic() + policy.deadline if policy.deadline else None
+    _count(provider, "calls")
+    last_error = None
+    last_result = None
+
+    for attempt in range(1, policy.max_attempts + 1):
+        if not breaker.allow():
+            _count(provider, "rejected")
+            raise CircuitOpenError(f"{provider} circuit is open") from last_error
+        _count(provider, "attempts")
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            breaker.record_failure()
+            _count(provider, "failures")
+            last_error = e
+        else:
+            last_error = None
+            last_result = result
+            if fail_if is not None and fail_if(result):
+                breaker.record_failure()
+                _count(provider, "failures")
+            else:
+                breaker.record_success()
+                if retry_if is None or not retry_if(result):
+                    _count(provider, "successes")
+                    return result
+
+        if attempt == policy.max_attempts:
+            break
+        delay = policy.backoff(attempt)
+        if deadline is not None and time.monotonic() + delay > deadline:
+            _count(provider, "deadline_exceeded")
+            raise DeadlineExceeded(f"{provider} request deadline exceeded") from last_error
+        _count(provider, "retries")
+        time.sleep(delay)
+
+    if last_error is not None:
+        raise last_error
+    raise RetryError(f"{provider} returned no usable result", last_result)
+
+
+def stream_with_retry(provider, fn, *args, policy=None, **kwargs):
+    """Yield from the iterable returned by fn(*args, **kwargs).
+
+    Opening the stream and waiting for its first item go through
+    call_with_retry; once a chunk has been handed to the caller a failure
+    can no longer be retried and is raised as is.
+    """
+    def first_item():
+        iterator = iter(fn(*args, **kwargs))
+        for item in iterator:
+            return item, iterator
+        return _EMPTY, iterator
+
+    first, iterator = call_with_retry(provider, first_item, policy=policy)
+    if first is _EMPTY:
+        return
+    yield first
+    yield from iterator
+
+
+def retry_metrics() -> dict:
+    """Per-provider counters plus the current breaker state."""
+    with _lock:
+        report = {provider: dict(counters) for provider, counters in _metrics.items()}
+        for provider, breaker in _breakers.items():
+            report.setdefault(provider, {})["breaker"] = breaker.state
+        return report
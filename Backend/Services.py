@@ -0,0 +1,98 @@
+"""
+Lazy service locator for the backend modules.
+
+Importing a backend pulls in its SDK (google.generativeai, cohere, pygame,
+edge_tts, pywhatkit, ...) and configures its client, which used to happen
+before the GUI could show. Entry points now go through the locator instead:
+
+    services.chatbot.ChatBotStream(query)   # Backend.Chatbot is imported here
+    services.loaded("tts")                   # False until something spoke
+    services.preload("model", "chatbot", delay=1.0)   # warm up after the window is up
+
+A service is imported once, on first use, even when several threads ask
+for it at the same moment; load_times records how long each one took.
+"""
+
+import time
+import threading
+import importlib
+
+SERVICES = {
+    "model": "Backend.Model",
+    "chatbot": "Backend.Chatbot",
+    "search": "Backend.RealtimeSearchEngine",
+    "automation": "Backend.Automation",
+    "images": "Backend.ImageGenration",
+    "tts": "Backend.TextToSpeech",
+}
+
+
+class ServiceLocator:
+    def __init__(self, services=SERVICES):
+        self._factories = {}
+        self._instances = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+        self.load_times = {}  # name -> seconds spent loading
+        for name, target in services.items():
+            self.register(name, target)
+
+    def register(self, name, factory):
+        """factory is a module path ("Backend.Chatbot") or a callable returning the service."""
+        if isinstance(factory, str):
+            module_name = factory
+            factory = lambda: importlib.import_module(module_name)
+        with self._lock:
+            self._factories[name] = factory
+            self._locks.setdefault(name, threading.Lock())
+            self._instances.pop(name, None)
+
+    def get(self, name):
+        try:
+            return self._instances[name]
+        except KeyError:
+            pass
+        try:
+            lock = self._locks[name]
+        except KeyError:
+            raise LookupError(f"Unknown service: {name}") from None
+        with lock:  # one loader per service, the others wait for its result
+            if name not in self._instances:
+                start = time.perf_counter()
+                self._instances[name] = self._factories[name]()
+                self.load_times[name] = time.perf_counter() - start
+        return self._instances[name]
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self.get(name)
+        except LookupError:
+            raise AttributeError(name) from None
+
+    def loaded(self, name) -> bool:
+        return name in self._instances
+
+    def preload(self, *names, delay=0.0):
+        """Load names (all services by default) in a background thread."""
+        names = names or tuple(self._factories)
+
+        def load():
+            if delay:
+                time.sleep(delay)
+            for name in names:
+                try:
+                    self.get(name)
+                except Exception as e:
+                    print(f"Could not preload {name}: {e}")
+
+        thread = threading.Thread(target=load, name="service-preload", daemon=True)
+        thread.start()
+        return thread
+
+    def report(self) -> str:
+        return " | ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.load_times.items())
+
+
+services = ServiceLocator()
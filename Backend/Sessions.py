@@ -0,0 +1,219 @@
+"""
+Conversation state per session, for front ends that serve several users.
+
+    conversation = sessions.get(session_id)        # Streamlit session or user id
+    ChatBotStream(query, conversation=conversation)
+    conversation.log.read_all()
+
+Each session has its own chat log under Data/Sessions/<id>/ and its own
+prompt windows, so two browser tabs never see each other's history. The
+desktop GUI and the CLIs use default_conversation(), which wraps the shared
+Data/ChatLog store.
+
+At most max_active conversations are kept open; the least recently used one
+is evicted when a new session arrives, and sessions idle for longer than
+idle_timeout are evicted on the next get(). Messages are on disk as soon as
+they are appended, so eviction only closes the log files and drops the prompt
+windows; the next get() reopens the log and the windows rebuild from its tail.
+An evicted conversation that is still referenced (a stream is writing to it)
+stays registered, and get() hands back that same object, so a directory is
+never open in two ChatLogStores at once.
+
+Session directories untouched for longer than retention are deleted (checked
+at most every SWEEP_INTERVAL seconds from get()). session_token() signs a
+session id so a front end can put it in a URL and resume the same history
+after a reload; session_from_token() rejects edited or made-up tokens.
+"""
+
+import os
+import re
+import hmac
+import time
+import shutil
+import hashlib
+import weakref
+import threading
+from collections import OrderedDict
+from Backend.ChatLog import ChatLogStore, get_chat_log, get_chat_log_writer
+from Backend.Config import get_config
+
+SESSION_DIR = os.path.join("Data", "Sessions")
+MAX_ACTIVE_SESSIONS = get_config().int("MaxActiveSessions", 64)
+SESSION_IDLE_TIMEOUT = get_config().float("SessionIdleTimeout", 30 * 60)
+SESSION_RETENTION = get_config().float("SessionRetention", 7 * 24 * 3600)  # seconds a session's log is kept
+SWEEP_INTERVAL = 3600
+SESSION_ID = re.compile(r"[^A-Za-z0-9_-]")
+SECRET_PATH = os.path.join(SESSION_DIR, ".secret")
+
+
+def _session_secret():
+    secret = get_config().get("SessionSecret")
+    if secret:
+        return secret.encode()
+    try:
+        with open(SECRET_PATH, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        pass
+    os.makedirs(SESSION_DIR, exist_ok=True)
+    secret = os.urandom(32)
+    try:
+        fd = os.open(SECRET_PATH, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:  # another process wrote it first
+        with open(SECRET_PATH, "rb") as f:
+            return f.read()
+    with os.fdopen(fd, "wb") as f:
+        f.write(secret)
+    return secret
+
+
+def _signature(session_id):
+    return hmac.new(_session_secret(), session_id.encode(), hashlib.sha256).hexdigest()[:32]
+
+
+def session_token(session_id) -> str:
+    """session_id plus its signature, safe to keep in a URL."""
+    return f"{session_id}.{_signature(session_id)}"
+
+
+def session_from_token(token):
+    """The session id a token was issued for, or None if it was not issued here."""
+    session_id, _, signature = str(token or "").partition(".")
+    if not session_id or SESSION_ID.search(session_id):
+        return None
+    return session_id if hmac.compare_digest(signature, _signature(session_id)) else None
+
+
+class Conversation:
+    """One session's chat log plus the prompt windows built over it."""
+
+    def __init__(self, session_id, log):
+        self.session_id = session_id
+        self.log = log
+        self.last_used = time.monotonic()
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def window(self, name, factory):
+        """This conversation's ContextWindow for a backend, made by factory() on first use."""
+        with self._lock:
+            if name not in self._windows:
+                self._windows[name] = factory()
+            return self._windows[name]
+
+    def close(self):
+        with self._lock:
+            self._windows.clear()
+        self.log.close()
+
+    def __repr__(self):
+        return f"Conversation({self.session_id!r})"
+
+
+class ConversationStore:
+    def __init__(self, directory=SESSION_DIR, max_active=MAX_ACTIVE_SESSIONS, idle_timeout=SESSION_IDLE_TIMEOUT,
+                 retention=SESSION_RETENTION):
+        self.directory = directory
+        self.max_active = max_active
+        self.idle_timeout = idle_timeout
+        self.retention = retention
+        self._swept_at = 0.0
+        self._active = OrderedDict()  # session id -> Conversation, least recently used first
+        self._evicted = weakref.WeakValueDictionary()  # evicted but still held by someone
+        self._lock = threading.Lock()
+        self.stats = {"opened": 0, "evicted": 0, "removed": 0}
+
+    def get(self, session_id) -> Conversation:
+        session_id = SESSION_ID.sub("_", str(session_id))[:64] or "anonymous"
+        with self._lock:
+            evicted = self._collect_idle(keep=session_id)
+            if time.monotonic() - self._swept_at >= SWEEP_INTERVAL:
+                self._sweep(keep=session_id)
+            conversation = self._active.get(session_id) or self._evicted.pop(session_id, None)
+            if conversation is None:
+                log = ChatLogStore(os.path.join(self.directory, session_id), legacy_path=None,
+                                   writer=get_chat_log_writer())
+                conversation = Conversation(session_id, log)
+                self.stats["opened"] += 1
+            self._active[session_id] = conversation
+            self._active.move_to_end(session_id)
+            while len(self._active) > self.max_active:
+                evicted.append(self._active.popitem(last=False)[1])
+            conversation.last_used = time.monotonic()
+            self._retire(evicted)
+        for old in evicted:
+            old.close()
+        return conversation
+
+    def _sweep(self, keep=None):
+        # caller holds self._lock, so no session is opened while its directory goes
+        self._swept_at = time.monotonic()
+        cutoff = time.time() - self.retention
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return
+        for name in names:
+            path = os.path.join(self.directory, name)
+            if name == keep or name in self._active or name in self._evicted or not os.path.isdir(path):
+                continue
+            try:
+                last_write = max([os.path.getmtime(path)] +
+                                 [os.path.getmtime(os.path.join(path, f)) for f in os.listdir(path)])
+            except OSError:
+                continue
+            if last_write < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+                self.stats["removed"] += 1
+
+    def remove_stale(self) -> int:
+        """Delete session directories idle for longer than retention now."""
+        with self._lock:
+            removed = self.stats["removed"]
+            self._sweep()
+            return self.stats["removed"] - removed
+
+    def _retire(self, evicted):
+        # caller holds self._lock
+        self.stats["evicted"] += len(evicted)
+        for old in evicted:
+            self._evicted[old.session_id] = old
+
+    def _collect_idle(self, keep=None):
+        cutoff = time.monotonic() - self.idle_timeout
+        idle = [sid for sid, conversation in self._active.items() if conversation.last_used < cutoff and sid != keep]
+        return [self._active.pop(sid) for sid in idle]
+
+    def evict_idle(self) -> int:
+        with self._lock:
+            evicted = self._collect_idle()
+            self._retire(evicted)
+        for old in evicted:
+            old.close()
+        return len(evicted)
+
+    def __len__(self):
+        return len(self._active)
+
+    def close(self):
+        with self._lock:
+            active = list(self._active.values())
+            self._active.clear()
+        for conversation in active:
+            conversation.close()
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_conversation() -> Conversation:
+    """The single-user conversation over the shared chat log."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = Conversation("default", get_chat_log())
+        return _default
+
+
+sessions = ConversationStore()
@@ -1,14 +1,18 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-from dotenv import dotenv_values
 import os
+import sys
+import time
+import threading
+import importlib.util
 import mtranslate as mt
+from Backend.EventBus import bus
+from Backend.Config import get_config
 
-env_vars = dotenv_values(".env")
-InputLanguage = env_vars.get("InputLanguage")
+# Optional offline backend for recorded audio files, imported when that backend starts
+SPEECH_RECOGNITION_AVAILABLE = importlib.util.find_spec("speech_recognition") is not None
+
+InputLanguage = get_config().input_language
+# browser (default), stdin, file:<transcript.txt> or audio:<file or folder>
+SpeechBackend = get_config().get("SpeechBackend", "browser")
 HtmlCode = HtmlCode = '''<!DOCTYPE html>
 <html lang="en">
 <head>
@@ -48,33 +52,29 @@ HtmlCode = HtmlCode = '''<!DOCTYPE html>
 
 HtmlCode = str(HtmlCode).replace("recognition.lang = ''", f"recognition.lang = '{InputLanguage}';")
 
-with open("Data/Voice.html", "w") as f:
-    f.write(HtmlCode)
-
 current_dir = os.getcwd()
 Link = f"{current_dir}/Data/Voice.html"
 
-chrome_options = Options()
-user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/89.0.142.86 Safari/537.36"
-chrome_options.add_argument(f"user-agent={user_agent}")
-chrome_options.add_argument("--use-fake-ui-for-media-stream")
-chrome_options.add_argument("--use-fake-device-for-media-stream")
-chrome_options.add_argument("--headless=new")
-
-service = Service(ChromeDriverManager().install())
-driver = webdriver.Chrome(service=service, options=chrome_options)
+# Resolves as soon as the recognised text appears, so the wait happens inside
+# the browser instead of a find_element loop pinning a core.
+WAIT_FOR_TRANSCRIPT_JS = '''
+const done = arguments[arguments.length - 1];
+const output = document.getElementById('output');
+if (window.axisObserver) { window.axisObserver.disconnect(); }
+if (output.textContent) { done(output.textContent); return; }
+window.axisObserver = new MutationObserver(() => {
+    if (output.textContent) { window.axisObserver.disconnect(); done(output.textContent); }
+});
+window.axisObserver.observe(output, {childList: true, characterData: true, subtree: true});
+'''
 
-# Cross-platform path handling
-TempDirPath = os.path.join(current_dir, "Frontend", "Files")
 def SetAssistantStatus(Status):
-    status_file_path = os.path.join(TempDirPath, "Status.data")
-    with open(status_file_path, "w", encoding="utf-8") as file:
-        file.write(Status)
+    bus.publish("status", Status)
 
 def QueryModifier(Query):
     new_query = Query.lower().strip()
     query_words = new_query.split()
-    question_words = ["how", "what", "who", "where", "when", "why", "which", "whose", "whom", "can you", 
+    question_words = ["how", "what", "who", "where", "when", "why", "which", "whose", "whom", "can you",
                       "what's", "where's", "how's", "can you"]
 
     if any(word + " " in new_query for word in question_words):
@@ -94,31 +94,214 @@ def UniversalTranslator(Text):
     english_translation = mt.translate(Text, "en", "auto")
     return english_translation.capitalize()
 
-def SpeechRecognition():
-    driver.get("file:///" + Link)
-    driver.find_element(By.ID, value="start").click()
+# -------------------------------
+# Recognition backends
+# -------------------------------
+
+class BrowserBackend:
+    """Headless Chrome running the Web Speech API page; started on first use.
+
+    One recognition session stays open across listen() timeouts, so speech
+    that runs past a timeout is not cut off; it is reset after a result.
+    """
+
+    def __init__(self, wait_slice=1.0):
+        self.wait_slice = wait_slice  # how often a waiting listen() checks for stop
+        self.driver = None
+        self.session_open = False
+
+    def start(self):
+        if self.driver is not None:
+            return
+        # selenium and webdriver-manager are only needed once someone actually listens
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver.chrome.options import Options
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        os.makedirs("Data", exist_ok=True)
+        with open("Data/Voice.html", "w") as f:
+            f.write(HtmlCode)
+
+        chrome_options = Options()
+        user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/89.0.142.86 Safari/537.36"
+        chrome_options.add_argument(f"user-agent={user_agent}")
+        chrome_options.add_argument("--use-fake-ui-for-media-stream")
+        chrome_options.add_argument("--use-fake-device-for-media-stream")
+        chrome_options.add_argument("--headless=new")
+
+        service = Service(ChromeDriverManager().install())
+        self.driver = webdriver.Chrome(service=service, options=chrome_options)
+        self.driver.set_script_timeout(self.wait_slice)
+
+    def listen(self, stop_event, timeout=None):
+        from selenium.webdriver.common.by import By
+        from selenium.common.exceptions import TimeoutException
+
+        if not self.session_open:
+            self.driver.get("file:///" + Link)  # fresh page, same browser
+            self.driver.find_element(By.ID, value="start").click()
+            self.session_open = True
+        deadline = time.monotonic() + timeout if timeout else None
+        while not stop_event.is_set():
+            if deadline is not None and time.monotonic() >= deadline:
+                return None  # still listening, the next listen() picks up where this one stopped
+            try:
+                Text = self.driver.execute_async_script(WAIT_FOR_TRANSCRIPT_JS)
+            except TimeoutException:
+                continue
+            self.end_session()
+            return Text
+        self.end_session()
+        return None
+
+    def end_session(self):
+        if self.session_open:
+            from selenium.webdriver.common.by import By
+            self.driver.find_element(By.ID, value="end").click()
+            self.session_open = False
+
+    def close(self):
+        if self.driver is not None:
+            self.driver.quit()
+            self.driver = None
+            self.session_open = False
+
+
+class TranscriptBackend:
+    """Offline backend: every non-empty line of a text file (or stdin) is one utterance."""
+
+    def __init__(self, path="-"):
+        self.path = path
+        self.stream = None
+
+    def start(self):
+        if self.stream is None:
+            self.stream = sys.stdin if self.path == "-" else open(self.path, "r", encoding="utf-8")
 
-    while True:
-        try:
-            Text = driver.find_element(By.ID, value="output").text
+    def listen(self, stop_event, timeout=None):
+        for line in self.stream:
+            if stop_event.is_set():
+                return None
+            if line.strip():
+                return line.strip()
+        return None  # end of transcript
 
-            if Text:
-                driver.find_element(By.ID, value="end").click()
+    def close(self):
+        if self.stream is not None and self.stream is not sys.stdin:
+            self.stream.close()
+        self.stream = None
 
-                if InputLanguage.lower() == "en" or "en" in InputLanguage.lower():
-                    return QueryModifier(Text)
-                else:
-                    SetAssistantStatus("Translating ...")
-                    return QueryModifier(UniversalTranslator(Text))
 
-        except Exception as e:
-            pass
-        
+class AudioFileBackend:
+    """Offline backend: transcribes recorded .wav files one per listen()."""
+
+    def __init__(self, path):
+        self.path = path
+        self.files = None
+        self.recognizer = None
+        self.sr = None
+
+    def start(self):
+        if not SPEECH_RECOGNITION_AVAILABLE:
+            raise RuntimeError("Audio file backend needs the 'SpeechRecognition' package.")
+        if self.files is None:
+            if os.path.isdir(self.path):
+                self.files = [os.path.join(self.path, name) for name in sorted(os.listdir(self.path))
+                              if name.lower().endswith((".wav", ".flac", ".aiff"))]
+            else:
+                self.files = [self.path]
+            import speech_recognition as sr
+            self.sr = sr
+            self.recognizer = sr.Recognizer()
+
+    def listen(self, stop_event, timeout=None):
+        while self.files and not stop_event.is_set():
+            with self.sr.AudioFile(self.files.pop(0)) as source:
+                audio = self.recognizer.record(source)
+            try:
+                return self.recognizer.recognize_google(audio, language=InputLanguage)
+            except self.sr.UnknownValueError:
+                continue
+        return None
+
+    def close(self):
+        self.files = None
+
+
+def CreateBackend(spec=None):
+    spec = spec or SpeechBackend
+    if spec == "stdin":
+        return TranscriptBackend("-")
+    if spec.startswith("file:"):
+        return TranscriptBackend(spec[len("file:"):])
+    if spec.startswith("audio:"):
+        return AudioFileBackend(spec[len("audio:"):])
+    return BrowserBackend()
+
+# -------------------------------
+# Recognition worker
+# -------------------------------
+
+class RecognitionWorker:
+    """Reusable recogniser: the backend starts on the first listen() and is
+    kept alive between utterances; waiting for speech does not spin a core."""
+
+    def __init__(self, backend=None):
+        self.backend = backend or CreateBackend()
+        self.started = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def _postprocess(self, Text):
+        if InputLanguage.lower() == "en" or "en" in InputLanguage.lower():
+            return QueryModifier(Text)
+        SetAssistantStatus("Translating ...")
+        return QueryModifier(UniversalTranslator(Text))
+
+    def listen(self, timeout=None):
+        """Block until one utterance is recognised; None on timeout, close() or
+        end of input (offline backends)."""
+        with self._lock:
+            if not self.started:
+                self.backend.start()
+                self.started = True
+            Text = self.backend.listen(self._stop, timeout)
+        return self._postprocess(Text) if Text else None
+
+    def close(self):
+        self._stop.set()  # a waiting listen() returns and releases the lock
+        with self._lock:
+            self.backend.close()
+            self.started = False
+        self._stop.clear()
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+def GetRecognitionWorker():
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = RecognitionWorker()
+        return _worker
+
+def SpeechRecognition():
+    return GetRecognitionWorker().listen()
+
 
 if __name__ == "__main__":
+    # SpeechBackend=file:phrases.txt (or stdin) se bina browser ke latency naap sakte hai
+    worker = GetRecognitionWorker()
     try:
         while True:
+            start = time.perf_counter()
             Text = SpeechRecognition()
-            print(Text)
+            if Text is None:
+                break
+            print(f"{Text}  ({(time.perf_counter() - start) * 1000:.1f} ms)")
     except KeyboardInterrupt:
-        driver.quit()
\ No newline at end of file
+        pass
+    finally:
+        worker.close()
@@ -3,48 +3,118 @@ import random
 import asyncio
 import edge_tts #this is microsoft service which provide text to speechj
 import os
-from dotenv import dotenv_values
+import re
+import queue
+import threading
+from Backend.Config import get_config
 
-env_vars = dotenv_values(".env")
-AssistantVoice = env_vars.get("AssistantVoice")
+SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+")
+MIN_CHUNK_CHARS = 40  # chhote sentences ko jod dete hai taaki har chunk pe alag network call na ho
+AUDIO_SLOTS = 3  # chunk N playing, N+1 queued, N+2 being synthesised
 
 # Asynchronous function to make a text to audio file means do multiple work once at a time
-async def TextToAudioFile(text) -> None:
+async def TextToAudioFile(text, file_path=None) -> None:
     # Cross-platform path handling
-    file_path = os.path.join("Data", "speech.mp3")
+    file_path = file_path or os.path.join("Data", "speech.mp3")
     if os.path.exists(file_path):
         os.remove(file_path)
-    communicate = edge_tts.Communicate(text, AssistantVoice, pitch='+5Hz', rate='+13%') # yahan cond. lagai hai voice ki pitch ki
+    communicate = edge_tts.Communicate(text, get_config().assistant_voice, pitch='+5Hz', rate='+13%') # yahan cond. lagai hai voice ki pitch ki
     await communicate.save(file_path)
 
-def TTS(Text, func=lambda r=None: True): #hre it is synchronous in this when it speaks then yire koi function listening nhii krega
-    while True:
-        try:
-            asyncio.run(TextToAudioFile(Text))
-            pygame.mixer.init()
-            # Cross-platform path handling
-            audio_file_path = os.path.join("Data", "speech.mp3")
-            pygame.mixer.music.load(audio_file_path)
-            pygame.mixer.music.play()
-            #wait when audio is playing
-            while pygame.mixer.music.get_busy():
-                #if call back return false then it stop speaking
-                if func() == False:
-                    break
-                pygame.time.Clock().tick(10)
+def SplitSentences(Text, min_chars=MIN_CHUNK_CHARS):
+    chunks = []
+    current = ""
+    for sentence in SENTENCE_BREAK.split(str(Text).strip()):
+        current = f"{current} {sentence}".strip()
+        if len(current) >= min_chars:
+            chunks.append(current)
+            current = ""
+    if current:
+        chunks.append(current)
+    return chunks
 
-            return True
+class SpeechPipeline:
+    """Synthesises sentence N+1 while sentence N is playing; the mixer stays initialised."""
 
-        except Exception as e:
-            print(f"Error in TTS: {e}")
+    def __init__(self):
+        self.lock = threading.Lock()  # one utterance at a time
+        self.clock = None
 
+    def _ensure_mixer(self):
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+            self.clock = pygame.time.Clock()
+
+    def _produce(self, chunks, ready, stop):
+        os.makedirs("Data", exist_ok=True)
+        loop = asyncio.new_event_loop()
+        try:
+            for i, chunk in enumerate(chunks):
+                if stop.is_set():
+                    break
+                file_path = os.path.join("Data", f"speech_{i % AUDIO_SLOTS}.mp3")
+                loop.run_until_complete(TextToAudioFile(chunk, file_path))
+                ready.put(file_path)
+        except Exception as e:
+            ready.put(e)
         finally:
+            loop.close()
+            ready.put(None)
+
+    def speak(self, Text, func=lambda r=None: True):
+        chunks = SplitSentences(Text)
+        if not chunks:
+            return True
+        with self.lock:
+            ready = queue.Queue(maxsize=1)
+            stop = threading.Event()
+            producer = threading.Thread(target=self._produce, args=(chunks, ready, stop), daemon=True)
+            producer.start()
             try:
-                func(False)#agr func false hoga then yie stop ho jayega 
-                pygame.mixer.music.stop()
-                pygame.mixer.quit()
+                self._ensure_mixer()
+                while True:
+                    item = ready.get()
+                    if item is None:
+                        return True
+                    if isinstance(item, Exception):
+                        raise item
+                    pygame.mixer.music.load(item)
+                    pygame.mixer.music.play()
+                    #wait when audio is playing
+                    while pygame.mixer.music.get_busy():
+                        #if call back return false then it stop speaking
+                        if func() == False:
+                            return True
+                        self.clock.tick(10)
+                    pygame.mixer.music.unload()
+
             except Exception as e:
-                print(f"Error in finally block: {e}")
+                print(f"Error in TTS: {e}")
+                return False
+
+            finally:
+                stop.set()
+                while producer.is_alive():  # unblock the producer if it is waiting on put()
+                    try:
+                        ready.get(timeout=0.1)
+                    except queue.Empty:
+                        pass
+                try:
+                    func(False)#agr func false hoga then yie stop ho jayega 
+                    if pygame.mixer.get_init():
+                        pygame.mixer.music.stop()
+                        pygame.mixer.music.unload()
+                except Exception as e:
+                    print(f"Error in finally block: {e}")
+
+    def close(self):
+        if pygame.mixer.get_init():
+            pygame.mixer.quit()
+
+pipeline = SpeechPipeline()
+
+def TTS(Text, func=lambda r=None: True): #hre it is synchronous in this when it speaks then yire koi function listening nhii krega
+    return pipeline.speak(Text, func)
 #it is func for hold high level task
 def TextToSpeech(Text, func=lambda r=None: True):
     Data = str(Text).split(".")
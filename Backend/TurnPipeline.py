@@ -0,0 +1,224 @@
+"""
+Asyncio pipeline for one assistant turn (what MainExecution used to do
+strictly in sequence).
+
+    pipeline = TurnPipeline(show_answer=StreamTextToScreen, speak=TextToSpeech,
+                            set_status=SetAssistantStatus, assistant_name="Axis")
+    result = pipeline.run_sync(Query)   # called from the backend thread
+    print(result.timings.report())
+
+Stages that do not depend on each other overlap:
+
+* a Google search for realtime-looking queries starts while FirstLayerDMM is
+  still classifying, and is handed to RealtimeSearchEngine when the decision
+  turns out to be that same realtime question (the only item, or the same
+  text after QueryModifier);
+* automation commands run alongside answer generation and speech;
+* image prompts are handed to the in-process image service, so the next
+  turn does not wait for them.
+
+Backends are reached through the service locator, so constructing a
+pipeline imports none of them; the first lookup of each one runs in the
+executor so its import never blocks the event loop.
+
+Every stage records when it started and how long it took in TurnTimings.
+"""
+
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from Backend.Services import services
+from Backend.SpeechToText import QueryModifier
+
+# Words that make a query worth searching for before the DMM has decided
+REALTIME_HINTS = ("who", "what", "when", "where", "latest", "news", "today", "current",
+                  "price", "score", "result", "released", "update")
+
+
+def LooksRealtime(Query):
+    words = set(Query.lower().replace("?", " ").replace(".", " ").split())
+    return any(hint in words for hint in REALTIME_HINTS)
+
+
+def SameQuery(a, b):
+    return " ".join(a.lower().split()) == " ".join(b.lower().split())
+
+
+class TurnTimings:
+    """Start offset and duration (seconds) of every stage in one turn."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = []  # (name, start_offset, duration)
+        self.marks = {}  # name -> offset
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append((name, start - self.started, time.perf_counter() - start))
+
+    def mark(self, name):
+        self.marks.setdefault(name, time.perf_counter() - self.started)
+
+    def total(self) -> float:
+        return max((start + duration for _, start, duration in self.stages), default=0.0)
+
+    def report(self) -> str:
+        parts = [f"{name} {start * 1000:.0f}+{duration * 1000:.0f}ms"
+                 for name, start, duration in sorted(self.stages, key=lambda s: s[1])]
+        parts += [f"{name} @{offset * 1000:.0f}ms" for name, offset in self.marks.items()]
+        return " | ".join(parts)
+
+
+class TurnResult:
+    def __init__(self, query, timings):
+        self.query = query
+        self.timings = timings
+        self.decision = []
+        self.answer = None
+        self.image_jobs = []
+        self.exit = False
+
+
+class TurnPipeline:
+    """Runs turns on its own event loop thread, so background work such as
+    a speculative search keeps going between turns."""
+
+    def __init__(self, show_answer, speak, set_status, assistant_name="Assistant",
+                 speculative_search=True):
+        self.show_answer = show_answer  # show_answer(prefix, chunks) -> full text
+        self.speak = speak
+        self.set_status = set_status
+        self.assistant_name = assistant_name
+        self.speculative_search = speculative_search
+        self.background = set()
+        self.last_timings = None
+        self._loop = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, daemon=True).start()
+            return self._loop
+
+    def run_sync(self, Query) -> TurnResult:
+        return asyncio.run_coroutine_threadsafe(self.run(Query), self._ensure_loop()).result()
+
+    def _spawn(self, coro):
+        task = asyncio.ensure_future(coro)
+        self.background.add(task)
+        task.add_done_callback(self.background.discard)
+        return task
+
+    async def _timed(self, timings, name, func, *args):
+        with timings.stage(name):
+            return await asyncio.to_thread(func, *args)
+
+    async def _service(self, name):
+        """services.<name>, imported in the executor the first time."""
+        if services.loaded(name):
+            return services.get(name)
+        return await asyncio.to_thread(services.get, name)
+
+    @staticmethod
+    def _prefetch_search(query):
+        return services.search.GoogleSearch(query)
+
+    @staticmethod
+    def _decide(Query):
+        return services.model.FirstLayerDMM(Query)
+
+    async def run(self, Query) -> TurnResult:
+        timings = TurnTimings()
+        result = TurnResult(Query, timings)
+
+        prefetch = prefetch_query = None
+        if self.speculative_search and LooksRealtime(Query):
+            prefetch_query = QueryModifier(Query)
+            prefetch = self._spawn(self._timed(timings, "prefetch", self._prefetch_search, prefetch_query))
+
+        self.set_status("Thinking...")
+        Decision = await self._timed(timings, "decision", self._decide, Query)
+        result.decision = Decision
+        print(f"\n💭 Decision: {Decision}\n")
+
+        for query in Decision:
+            if "generate " in query:
+                images = await self._service("images")
+                job = images.image_service.submit(query)
+                result.image_jobs.append(job)
+                print(f"🎨 Image job {job.id} queued")
+
+        parallel = []
+        # the automation module registers the built-in commands when it loads
+        registry = (await self._service("automation")).registry
+        commands = [query for query in Decision if registry.is_command(query)]
+        if commands:
+            parallel.append(self._automation(commands, timings))
+
+        R = any(i.startswith("realtime") for i in Decision)
+        Merged_query = " and ".join(
+            [" ".join(i.split()[1:]) for i in Decision if i.startswith("general") or i.startswith("realtime")]
+        )
+
+        if R:
+            # the speculative search only answers the question if the DMM kept it whole
+            usable = prefetch is not None and (
+                len(Decision) == 1 or SameQuery(QueryModifier(Merged_query), prefetch_query))
+            parallel.append(self._answer(result, "realtime", Merged_query, prefetch if usable else None))
+        else:
+            for query in Decision:
+                if "general" in query:
+                    parallel.append(self._answer(result, "general", query.replace("general ", "")))
+                    break
+                elif "realtime" in query:
+                    parallel.append(self._answer(result, "realtime", query.replace("realtime ", "")))
+                    break
+                elif "exit" in query:
+                    parallel.append(self._answer(result, "general", "Okay, Bye!"))
+                    result.exit = True
+                    break
+
+        await asyncio.gather(*parallel)
+        self.last_timings = timings
+        print(f"⏱️  {timings.report()}")
+        return result
+
+    async def _automation(self, commands, timings):
+        with timings.stage("automation"):
+            try:
+                await (await self._service("automation")).Automation(commands)
+            except Exception as e:
+                print(f"❌ Automation failed: {e}")
+
+    async def _answer(self, result, kind, text, prefetch=None):
+        timings = result.timings
+        if kind == "realtime":
+            self.set_status("Searching...")
+            search_results = None
+            if prefetch is not None:
+                with timings.stage("prefetch wait"):
+                    search_results = await prefetch
+            stream = (await self._service("search")).RealtimeSearchEngineStream(QueryModifier(text), search_results)
+        else:
+            stream = (await self._service("chatbot")).ChatBotStream(QueryModifier(text))
+
+        def first_token(chunks):
+            for chunk in chunks:
+                timings.mark("first token")
+                yield chunk
+
+        result.answer = await self._timed(timings, "answer", self.show_answer,
+                                          f"{self.assistant_name} : ", first_token(stream))
+        self.set_status("Answering...")
+        await self._timed(timings, "speech", self.speak, result.answer)
+
+    def close(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
@@ -0,0 +1,105 @@
+"""
+Local stand-in for ipinfo.io and OpenWeatherMap, for checking the weather
+caches in RealtimeSearchEngine without network access or an API key.
+
+    python -m Backend.WeatherStub            # self-check against the stub
+    python -m Backend.WeatherStub --serve    # just run the stub on port 8765
+
+To use it by hand, point the app at it in .env:
+
+    IPInfoURL=http://127.0.0.1:8765/json
+    WeatherAPIURL=http://127.0.0.1:8765/data/2.5/weather
+"""
+
+import sys
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+STUB_CITY = "Pune"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    counts = {"ipinfo": 0, "weather": 0}
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/json":
+            self.counts["ipinfo"] += 1
+            self._send(200, {"city": STUB_CITY, "country": "IN"})
+        elif url.path == "/data/2.5/weather":
+            self.counts["weather"] += 1
+            city = parse_qs(url.query).get("q", [""])[0]
+            if city.lower() == "nowhere":
+                self._send(404, {"cod": "404", "message": "city not found"})
+                return
+            self._send(200, {
+                "name": city.title(), "sys": {"country": "IN"},
+                "main": {"temp": 24.0, "feels_like": 25.0, "humidity": 60, "pressure": 1012},
+                "weather": [{"description": "clear sky"}], "wind": {"speed": 3.1},
+            })
+        else:
+            self._send(404, {})
+
+    def log_message(self, format, *args):
+        pass  # keep the self-check output readable
+
+
+def start_stub(port=0):
+    """Start the stub on a background thread; returns (server, base_url)."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def self_check():
+    from Backend import RealtimeSearchEngine as engine
+    from Backend.Config import get_config, reload_config
+
+    server, base_url = start_stub()
+    engine.IPInfoURL = f"{base_url}/json"
+    engine.WeatherAPIURL = f"{base_url}/data/2.5/weather"
+    if not get_config().weather_api_key:
+        reload_config(overrides={"WeatherAPIKey": "stub-key"})
+    counts = StubHandler.counts
+
+    try:
+        for _ in range(3):
+            engine.GetWeather()  # no city: IP lookup once, then cached weather
+        assert counts == {"ipinfo": 1, "weather": 1}, counts
+
+        engine.GetWeather("Mumbai")
+        engine.GetWeather("mumbai")
+        assert counts["weather"] == 2, counts
+
+        engine.GetWeather("Nowhere")
+        engine.GetWeather("Nowhere")  # errors are not cached
+        assert counts["weather"] == 4, counts
+
+        engine.weather_cache.clear()
+        engine.GetWeather()
+        assert counts == {"ipinfo": 1, "weather": 5}, counts
+    finally:
+        server.shutdown()
+    print(f"Weather cache OK: {counts}, cache stats {engine.weather_cache.stats()}")
+
+
+if __name__ == "__main__":
+    if "--serve" in sys.argv:
+        server, base_url = start_stub(8765)
+        print(f"Weather stub listening on {base_url} (Ctrl+C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+    else:
+        self_check()
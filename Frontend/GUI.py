@@ -1,12 +1,15 @@
-from PyQt5.QtWidgets import QApplication, QMainWindow, QTextEdit, QStackedWidget, QLineEdit, QGridLayout, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QFrame, QLabel, QSizePolicy
-from PyQt5.QtGui import QIcon, QPainter, QMovie, QColor, QTextCharFormat, QFont, QPixmap, QTextBlockFormat
-from PyQt5.QtCore import Qt, QSize, QTimer, QTime, QPropertyAnimation, QEasingCurve
-from dotenv import dotenv_values
+from PyQt5.QtWidgets import QApplication, QMainWindow, QPlainTextEdit, QStackedWidget, QLineEdit, QGridLayout, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QFrame, QLabel, QSizePolicy
+from PyQt5.QtGui import QIcon, QPainter, QMovie, QColor, QTextCharFormat, QFont, QPixmap, QTextCursor
+from PyQt5.QtCore import Qt, QSize, QTimer, QTime, QPropertyAnimation, QEasingCurve, QObject, pyqtSignal
+from Backend.EventBus import bus
+from Backend.Config import get_config
+from collections import deque
 import sys
 import os
 
-env_vars = dotenv_values(".env")
-Assistantname = env_vars.get("Assistantname")
+Assistantname = get_config().assistantname
+# Lines kept in the chat view; new output trims the top, scroll-back trims the bottom
+ChatMaxBlocks = get_config().int("ChatMaxBlocks", 2000)
 current_dir = os.getcwd()
 old_chat_message = ""
 TempDirPath = os.path.join(current_dir, "Frontend", "Files")
@@ -36,23 +39,21 @@ def QueryModifier(Query):
 
     return new_query.capitalize()
 
+# Mic / status / response state lives on the event bus instead of Frontend/Files/*.data
 def SetMicrophoneStatus(Command):
-    with open(os.path.join(TempDirPath, 'Mic.data'), "w", encoding='utf-8') as file:
-        file.write(Command)
+    bus.publish("mic", Command)
 
 def GetMicrophoneStatus():
-    with open(os.path.join(TempDirPath, 'Mic.data'), "r", encoding='utf-8') as file:
-        Status = file.read()
-    return Status
+    return bus.get("mic", "False")
+
+def WaitForMicrophoneStatus(Command, timeout=None):
+    return bus.wait_for("mic", lambda Status: Status == Command, timeout)
 
 def SetAssistantStatus(Status):
-    with open(os.path.join(TempDirPath, 'Status.data'), "w", encoding='utf-8') as file:
-        file.write(Status)
+    bus.publish("status", Status)
 
 def GetAssistantStatus():
-    with open(os.path.join(TempDirPath, 'Status.data'), "r", encoding='utf-8') as file:
-        Status = file.read()
-    return Status
+    return bus.get("status", "")
 
 def MicButtonInitialed():
     SetMicrophoneStatus("False")
@@ -69,8 +70,43 @@ def TempDirectoryPath(Filename):
     return Path
 
 def ShowTextToScreen(Text):
-    with open(os.path.join(TempDirPath, 'Responses.data'), 'w', encoding='utf-8') as file:
-        file.write(Text)
+    bus.publish("responses", Text)
+
+# HistorySource() returns the previous page of history as formatted messages,
+# oldest first ([] when there is none); the first call returns the latest page.
+# HistoryTrimmed(n) is told when the n oldest messages it handed out left the
+# view, HistoryTrimmed(None) when the view was cleared and starts over.
+HistorySource = None
+HistoryTrimmed = None
+
+def SetHistorySource(Source, Trimmed=None):
+    global HistorySource, HistoryTrimmed
+    HistorySource, HistoryTrimmed = Source, Trimmed
+    bus.publish("history", "ready")  # the chat view pulls the latest page
+
+def StreamTextToScreen(Prefix, Chunks):
+    """Show an answer on screen chunk by chunk as it is generated; returns the
+    full answer (without Prefix) once the stream ends."""
+    bus.publish("stream.start", Prefix)
+    Text = ""
+    try:
+        for Chunk in Chunks:
+            Text += Chunk
+            bus.publish("stream.chunk", Chunk)
+    finally:
+        bus.publish("stream.end", Prefix + Text)
+        bus.publish("responses", Prefix + Text)  # latest message for late subscribers
+    return Text
+
+# Bus callbacks run on the backend thread; the signal hands them to the Qt thread
+class BusBridge(QObject):
+    received = pyqtSignal(str, str)
+
+    def __init__(self, topics, slot, replay=True):
+        super().__init__()
+        self.received.connect(slot)  # connect before subscribing so the replayed value arrives
+        for topic in topics:
+            bus.subscribe(topic, lambda value, topic=topic: self.received.emit(topic, str(value)), replay)
 
 class ChatSection(QWidget):
     def __init__(self):
@@ -80,10 +116,17 @@ class ChatSection(QWidget):
         layout.setSpacing(-100)
         
         # Smooth scrolling animation
-        self.chat_text_edit = QTextEdit()
+        # plain text view: layout cost stays per visible line and the block cap bounds memory
+        self.chat_text_edit = QPlainTextEdit()
         self.chat_text_edit.setReadOnly(True)
         self.chat_text_edit.setTextInteractionFlags(Qt.NoTextInteraction)
         self.chat_text_edit.setFrameStyle(QFrame.NoFrame)
+        # ChatMaxBlocks is enforced in trimTop / trimBottom rather than with
+        # setMaximumBlockCount, so the history pager always knows what is shown
+        self.history_blocks = deque()  # lines of each history message at the top, oldest first
+        self.history_exhausted = False
+        self.tail_trimmed = False  # scroll-back dropped the newest lines
+        self.chat_text_edit.verticalScrollBar().valueChanged.connect(self.onScroll)
         
         # Add smooth fade-in effect
         self.fade_animation = QPropertyAnimation(self.chat_text_edit, b"windowOpacity")
@@ -138,12 +181,14 @@ class ChatSection(QWidget):
         font.setPointSize(13)
         self.chat_text_edit.setFont(font)
         
-        # Timer for updating messages, status and clock
+        # Messages and status are pushed from the bus; the timer only drives the clock
+        self.bridge = BusBridge(["responses", "status", "history"], self.onBusEvent)
+        # Streamed answers grow in place; stale chunks are never replayed
+        self.stream_bridge = BusBridge(["stream.start", "stream.chunk", "stream.end"], self.onStreamEvent, replay=False)
         self.timer = QTimer(self)
-        self.timer.timeout.connect(self.loadMessages)
-        self.timer.timeout.connect(self.SpeechRecogText)
         self.timer.timeout.connect(self.updateClock)
-        self.timer.start(5)
+        self.timer.start(1000)
+        self.updateClock()
         
         self.chat_text_edit.viewport().installEventFilter(self)
         self.setStyleSheet("""QScrollBar:vertical {
@@ -168,20 +213,118 @@ class ChatSection(QWidget):
             background: none;
         }""")
 
-    def loadMessages(self):
+    def onBusEvent(self, topic, value):
+        if topic == "responses":
+            self.loadMessages(value)
+        elif topic == "status":
+            self.SpeechRecogText(value)
+        elif topic == "history" and not self.history_blocks:
+            self.loadOlderMessages()
+
+    def onStreamEvent(self, topic, value):
+        global old_chat_message
+        if topic == "stream.start":
+            self.addMessage(message=value, color='White', end="")
+            self.fade_animation.start()
+            return
+        cursor = self.chat_text_edit.textCursor()
+        cursor.movePosition(QTextCursor.End)
+        if topic == "stream.chunk":
+            cursor.insertText(value)
+        else:
+            cursor.insertText("\n")
+            old_chat_message = value  # the final "responses" publish is already on screen
+        self.chat_text_edit.setTextCursor(cursor)
+        self.trimTop()
+
+    def loadMessages(self, messages):
         global old_chat_message
-        with open(TempDirectoryPath('Responses.data'), "r", encoding='utf-8') as file:
-            messages = file.read()
-            if None == messages or len(messages) <= 1 or str(old_chat_message) == str(messages):
-                return
-            self.addMessage(message=messages, color='White')
-            old_chat_message = messages
-            self.fade_animation.start()  # Start fade animation when new message arrives
-
-    def SpeechRecogText(self):
-        with open(TempDirectoryPath('Status.data'), "r", encoding='utf-8') as file:
-            messages = file.read()
-            self.label.setText(messages)
+        if None == messages or len(messages) <= 1 or str(old_chat_message) == str(messages):
+            return
+        self.addMessage(message=messages, color='White')
+        old_chat_message = messages
+        self.fade_animation.start()  # Start fade animation when new message arrives
+
+    def onScroll(self, value):
+        # purani history tabhi load hoti hai jab user upar tak scroll kare
+        scrollbar = self.chat_text_edit.verticalScrollBar()
+        if value != scrollbar.minimum() or self.history_exhausted or HistorySource is None:
+            return
+        if scrollbar.maximum() == scrollbar.minimum():
+            return  # nothing to scroll yet
+        self.loadOlderMessages()
+
+    def loadOlderMessages(self):
+        if HistorySource is None or self.history_exhausted:
+            return
+        older = HistorySource()
+        if not older:
+            self.history_exhausted = True
+            return
+        self.prependMessages(older, color='White')
+
+    def prependMessages(self, messages, color):
+        # blank messages take no lines but still count, so trims match the pager's messages
+        counts = [message.count("\n") + 1 if message else 0 for message in messages]
+        text = "\n".join(message for message in messages if message)
+        if text:
+            cursor = QTextCursor(self.chat_text_edit.document())
+            cursor.movePosition(QTextCursor.Start)
+            format = QTextCharFormat()
+            format.setForeground(QColor(color))
+            cursor.setCharFormat(format)
+            cursor.insertText(text + "\n")
+        self.history_blocks.extendleft(reversed(counts))
+        self.trimBottom()
+        # keep the lines the user was reading where they were
+        scrollbar = self.chat_text_edit.verticalScrollBar()
+        scrollbar.setValue(scrollbar.value() + sum(counts))
+
+    def trimBottom(self):
+        """Drop the newest lines over ChatMaxBlocks after older ones were paged in."""
+        document = self.chat_text_edit.document()
+        if document.blockCount() <= ChatMaxBlocks:
+            return
+        cursor = QTextCursor(document.findBlockByNumber(ChatMaxBlocks - 1))
+        cursor.movePosition(QTextCursor.EndOfBlock)
+        cursor.movePosition(QTextCursor.End, QTextCursor.KeepAnchor)
+        cursor.removeSelectedText()
+        self.tail_trimmed = True
+
+    def trimTop(self):
+        """Drop whole history messages (then the oldest live lines) over ChatMaxBlocks."""
+        document = self.chat_text_edit.document()
+        excess = document.blockCount() - ChatMaxBlocks
+        if excess <= 0:
+            return
+        dropped = lines = 0
+        while self.history_blocks and lines < excess:
+            lines += self.history_blocks.popleft()
+            dropped += 1
+        if lines < excess:
+            # live lines are going too; the pager cannot tell which messages they were
+            lines = excess
+            self.history_exhausted = True
+        cursor = QTextCursor(document)
+        cursor.movePosition(QTextCursor.Start)
+        cursor.movePosition(QTextCursor.NextBlock, QTextCursor.KeepAnchor, lines)
+        cursor.removeSelectedText()
+        if dropped and HistoryTrimmed is not None:
+            HistoryTrimmed(dropped)
+
+    def restartAtLatest(self):
+        """After scroll-back cut the newest lines, new output starts a fresh view
+        of the latest page instead of leaving a gap above it."""
+        self.chat_text_edit.clear()
+        self.history_blocks.clear()
+        self.history_exhausted = False
+        self.tail_trimmed = False
+        if HistoryTrimmed is not None:
+            HistoryTrimmed(None)
+        self.loadOlderMessages()
+
+    def SpeechRecogText(self, messages):
+        self.label.setText(messages)
 
     def updateClock(self):
         current_time = QTime.currentTime()
@@ -202,17 +345,17 @@ class ChatSection(QWidget):
             MicButtonClosed()
         self.toogled = not self.toogled
 
-    def addMessage(self, message, color):
+    def addMessage(self, message, color, end="\n"):
+        if self.tail_trimmed:
+            self.restartAtLatest()
         cursor = self.chat_text_edit.textCursor()
+        cursor.movePosition(QTextCursor.End)
         format = QTextCharFormat()
-        formatm = QTextBlockFormat()
-        formatm.setTopMargin(10)
-        formatm.setLeftMargin(10)
         format.setForeground(QColor(color))
         cursor.setCharFormat(format)
-        cursor.setBlockFormat(formatm)
-        cursor.insertText(message + "\n")
+        cursor.insertText(message + end)
         self.chat_text_edit.setTextCursor(cursor)
+        self.trimTop()
 
 class InitialScreen(QWidget):
     def __init__(self):
@@ -264,15 +407,14 @@ class InitialScreen(QWidget):
         self.setFixedWidth(screen_width)
         self.setStyleSheet("background-color: black;")
 
+        self.bridge = BusBridge(["status"], lambda topic, value: self.SpeechRecogText(value))
         self.timer = QTimer(self)
-        self.timer.timeout.connect(self.SpeechRecogText)
         self.timer.timeout.connect(self.updateClock)
-        self.timer.start(5)
+        self.timer.start(1000)
+        self.updateClock()
 
-    def SpeechRecogText(self):
-        with open(TempDirectoryPath('Status.data'), "r", encoding='utf-8') as file:
-            messages = file.read()
-            self.label.setText(messages)
+    def SpeechRecogText(self, messages):
+        self.label.setText(messages)
 
     def updateClock(self):
         current_time = QTime.currentTime()
@@ -2,153 +2,71 @@ from Frontend.GUI import (
 GraphicalUserInterface,
 SetAssistantStatus,
 ShowTextToScreen,
-TempDirectoryPath,
+StreamTextToScreen,
 SetMicrophoneStatus,
 AnswerModifier,
-QueryModifier,
 GetMicrophoneStatus,
-GetAssistantStatus
+GetAssistantStatus,
+WaitForMicrophoneStatus,
+SetHistorySource
 )
-from Backend.Model import FirstLayerDMM
-from Backend.RealtimeSearchEngine import RealtimeSearchEngine
-from Backend.Automation import Automation
+from Backend.Services import services
+from Backend.TurnPipeline import TurnPipeline
 from Backend.SpeechToText import SpeechRecognition
-from Backend.Chatbot import ChatBot
-from Backend.TextToSpeech import TextToSpeech
-from dotenv import dotenv_values
-from asyncio import run
-from time import sleep
-import subprocess
+from Backend.ChatLog import get_chat_log, HistoryPager
+from Backend.Config import get_config
 import threading
-import json
 import os
 
-env_vars = dotenv_values(".env")
-Username = env_vars.get("Username")
-Assistantname = env_vars.get("Assistantname")
+config = get_config()
+Username = config.username
+Assistantname = config.assistantname
 DefaultMessage = f'''{Username} : Hello {Assistantname}, How are you?
 {Assistantname} : Welcome {Username}. I am doing well. How may i help you?'''
-subprocesses = []
-Functions = ["open", "close", "play", "system", "content", "google search", "youtube search"]
+turn_pipeline = TurnPipeline(
+    show_answer=lambda prefix, chunks: AnswerModifier(StreamTextToScreen(prefix, chunks)),
+    speak=lambda text: services.tts.TextToSpeech(text), set_status=SetAssistantStatus,
+    assistant_name=Assistantname)
+HistoryMessages = 40 # start pe sirf last 40 messages, baaki scroll karne pe
+chat_history = HistoryPager(get_chat_log(), page_size=HistoryMessages)
 def ShowDefaultChatIfNoChats():
-    chatlog_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'Data', 'ChatLog.json')
-    with open(chatlog_path, "r", encoding='utf-8') as File:
-        content = File.read()
-        if len(content) < 5:
-            with open(TempDirectoryPath('Database.data'), 'w', encoding='utf-8') as file:
-                file.write("")
-            with open(TempDirectoryPath('Responses.data'), 'w', encoding='utf-8') as file:
-                file.write(DefaultMessage)
-def ReadChatLogJson():
-    with open(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'Data', 'ChatLog.json'), 'r', encoding='utf-8') as file:
-        chatlog_data = json.load(file)
-    return chatlog_data
+    if len(get_chat_log()) == 0:
+        ShowTextToScreen(DefaultMessage)
 
-def ChatLogIntegration():
-    json_data = ReadChatLogJson()
-    formatted_chatlog = ""
-    for entry in json_data:
-        if entry["role"] == "user":
-            formatted_chatlog += f"User: {entry['content']}\n"
-        elif entry["role"] == "assistant":
-            formatted_chatlog += f"Assistant: {entry['content']}\n"
-    formatted_chatlog = formatted_chatlog.replace("User", Username + " ")
-    formatted_chatlog = formatted_chatlog.replace("Assistant", Assistantname + " ")
-    with open(TempDirectoryPath('Database.data'), 'w', encoding='utf-8') as file:
-        file.write(AnswerModifier(formatted_chatlog))
+def FormatChatLog(messages):
+    names = {"user": Username + " ", "assistant": Assistantname + " "}
+    lines = [f"{names[entry['role']]}: {entry['content']}" for entry in messages if entry["role"] in names]
+    return AnswerModifier("\n".join(lines))
 
 def ShowChatsOnGUI():
-    File = open(TempDirectoryPath('Database.data'), "r", encoding='utf-8')
-    Data = File.read()
-    if len(str(Data)) > 0:
-        lines = Data.split('\n')
-        result = '\n'.join(lines)
-        File.close()
-        File = open(TempDirectoryPath('Responses.data'), "w", encoding='utf-8')
-        File.write(result)
-        File.close()
+    SetHistorySource(lambda: [FormatChatLog([message]) for message in chat_history.older()], chat_history.forget)
 def InitialExecution():
     SetMicrophoneStatus("False")
     ShowTextToScreen("")
     ShowDefaultChatIfNoChats()
-    ChatLogIntegration()
     ShowChatsOnGUI()
+    services.preload("model", "chatbot", "search", "automation", "tts", delay=1.0) # backends GUI dikhne ke baad load hote hai
 
 InitialExecution()
 
 def MainExecution():
-    TaskExecution = False
-    ImageExecution = False
-    ImageGenerationQuery = ""
-    SetAssistantStatus("Listening...")
-    Query = SpeechRecognition()
-    ShowTextToScreen(f"{Username} : {Query}")
-    SetAssistantStatus("Thinking...")
-    Decision = FirstLayerDMM(Query)
-    print("")
-    print(f"Decision : {Decision}")
-    print("")
-    G = any([i for i in Decision if i.startswith("general")])
-    R = any([i for i in Decision if i.startswith("realtime")])
-    Mearged_query = " and ".join(
-        [" ".join(i.split()[1:]) for i in Decision if i.startswith("general") or i.startswith("realtime")]
-    )
-    print(Mearged_query)
-    
-    for queries in Decision:
-        if "generate " in queries:
-            ImageGenerationQuery = str(queries)
-            ImageExecution = True
-    
-    for queries in Decision:
-        if TaskExecution == False:
-            if any(queries.startswith(func) for func in Functions):
-                run(Automation(list(Decision)))
-                TaskExecution = True    
-    if ImageExecution == True:
-        with open(os.path.join("Frontend", "Files", "ImageGeneration.data"), "w") as file:
-            file.write(f"{ImageGenerationQuery},True")
-        try:
-                image_gen_path = os.path.join(os.path.dirname(__file__), 'Backend', 'ImageGenration.py')
-                p1 = subprocess.Popen(['python', image_gen_path],
-                                      stdout=subprocess.PIPE, stderr=subprocess.PIPE,
-                                      stdin=subprocess.PIPE, shell=False)
-                subprocesses.append(p1)
-        except Exception as e:
-            print(f"Error starting ImageGeneration.py: {e}")
-    if G and R or R:
-        SetAssistantStatus("Searching ...")
-        Answer = RealtimeSearchEngine(QueryModifier(Mearged_query))
-        ShowTextToScreen(f"{Assistantname} : {Answer}")
-        SetAssistantStatus("Answering ...")
-        TextToSpeech(Answer)
-        return True        
-    else:
-        for Queries in Decision:
-            if "general" in Queries:
-                SetAssistantStatus("Thinking...")
-                QueryFinal = Queries.replace("general ", "")
-                Answer = ChatBot(QueryModifier(QueryFinal))
-                ShowTextToScreen(f"{Assistantname} : {Answer}")
-                SetAssistantStatus("Answering...")
-                TextToSpeech(Answer)
-                return True
-            elif "realtime" in Queries:
-                SetAssistantStatus("Searching ...")
-                QueryFinal = Queries.replace("realtime ", "")
-                Answer = RealtimeSearchEngine(QueryModifier(QueryFinal))
-                ShowTextToScreen(f"{Assistantname} : {Answer}")
-                SetAssistantStatus("Answering ...")
-                TextToSpeech(Answer)
-                return True
-            elif "exit" in Queries:
-                QueryFinal = "Okay, Bye!"
-                Answer = ChatBot(QueryModifier(QueryFinal))
-                ShowTextToScreen(f"{Assistantname} : {Answer}")
-                SetAssistantStatus("Answering ...")
-                TextToSpeech(Answer)
-                SetAssistantStatus("Answering ...")
-                os.exit(1)
+    try:
+        SetAssistantStatus("Listening...")
+        Query = SpeechRecognition()
+        if Query is None: # offline backend ka input khatam, mic band warna loop ghoomta rahega
+            SetMicrophoneStatus("False")
+            return False
+        if not Query.strip():
+            return False
+        ShowTextToScreen(f"{Username} : {Query}")
+        result = turn_pipeline.run_sync(Query) # decision, automation, images aur answer ek saath chalte hai
+    except Exception as e:
+        print(f"Error in MainExecution: {e}")
+        SetAssistantStatus("Error occurred")
+        return False
+    if result.exit:
+        os._exit(1)
+    return True
 def FirstThread():
     while True:
         CurrentStatus = GetMicrophoneStatus()
@@ -156,10 +74,9 @@ def FirstThread():
             MainExecution()
         else:
             AIStatus = GetAssistantStatus()
-            if "Available ..." in AIStatus:
-                sleep(0.1)
-            else:
+            if "Available ..." not in AIStatus:
                 SetAssistantStatus("Available ...")
+            WaitForMicrophoneStatus("True")
 def SecondThread():
     GraphicalUserInterface()
 
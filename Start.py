@@ -6,12 +6,8 @@ Main Startup File with All Functions
 
 import os
 import sys
-import json
 import threading
-import subprocess
 from time import sleep
-from asyncio import run
-from dotenv import dotenv_values
 import signal
 
 # Import Frontend Components
@@ -19,39 +15,37 @@ from Frontend.GUI import (
     GraphicalUserInterface,
     SetAssistantStatus,
     ShowTextToScreen,
-    TempDirectoryPath,
+    StreamTextToScreen,
     SetMicrophoneStatus,
     AnswerModifier,
-    QueryModifier,
     GetMicrophoneStatus,
-    GetAssistantStatus
+    GetAssistantStatus,
+    WaitForMicrophoneStatus,
+    SetHistorySource
 )
 
-# Import Backend Components
-from Backend.Model import FirstLayerDMM
-from Backend.RealtimeSearchEngine import RealtimeSearchEngine
-from Backend.Automation import Automation
-from Backend.SpeechToText import SpeechRecognition
-from Backend.Chatbot import ChatBot
-from Backend.TextToSpeech import TextToSpeech
+# Import Backend Components (model, search, automation, image and speech
+# backends load through the service locator on first use)
+from Backend.Services import services
+from Backend.TurnPipeline import TurnPipeline
+from Backend.SpeechToText import SpeechRecognition, GetRecognitionWorker
+from Backend.ChatLog import get_chat_log, HistoryPager
+from Backend.Config import get_config
 
 # ==================== CONFIGURATION ====================
 
 class Config:
     """Configuration Manager"""
     def __init__(self):
-        self.env_vars = dotenv_values(".env")
-        self.username = self.env_vars.get("Username", "User")
-        self.assistantname = self.env_vars.get("Assistantname", "Assistant")
+        self.env_vars = get_config()  # parsed once, shared with the backends
+        self.username = self.env_vars.username
+        self.assistantname = self.env_vars.assistantname
         self.default_message = f'''{self.username} : Hello {self.assistantname}, How are you?
 {self.assistantname} : Welcome {self.username}. I am doing well. How may i help you?'''
-        self.functions = ["open", "close", "play", "system", "content", "google search", "youtube search"]
-        self.subprocesses = []
         
         # Paths
         self.base_dir = os.path.dirname(os.path.abspath(__file__))
         self.data_dir = os.path.join(self.base_dir, "Data")
-        self.chatlog_path = os.path.join(self.data_dir, "ChatLog.json")
         
     def validate(self):
         """Validate configuration and required files"""
@@ -67,11 +61,8 @@ class Config:
             print(f"📁 Creating Data directory: {self.data_dir}")
             os.makedirs(self.data_dir)
             
-        # Check ChatLog.json
-        if not os.path.exists(self.chatlog_path):
-            print("📝 Creating ChatLog.json...")
-            with open(self.chatlog_path, 'w', encoding='utf-8') as f:
-                json.dump([], f)
+        # Open the chat log store (migrates a legacy ChatLog.json once)
+        get_chat_log()
         
         # Check API keys
         required_keys = ["GeminiAPIKey", "CohereAPIKey"]
@@ -85,72 +76,49 @@ class Config:
 # Global configuration instance
 config = Config()
 
+# One assistant turn: decision, automation, images and the streamed answer
+turn_pipeline = TurnPipeline(
+    show_answer=lambda prefix, chunks: AnswerModifier(StreamTextToScreen(prefix, chunks)),
+    speak=lambda text: services.tts.TextToSpeech(text),
+    set_status=SetAssistantStatus,
+    assistant_name=config.assistantname,
+)
+
 # ==================== INITIALIZATION FUNCTIONS ====================
 
+# Start-up shows only the most recent messages; older ones page in when the
+# chat view is scrolled to the top, so start-up cost does not grow with the log
+HISTORY_MESSAGES = 40
+chat_history = HistoryPager(get_chat_log(), page_size=HISTORY_MESSAGES)
+
 def ShowDefaultChatIfNoChats():
     """Display default chat message if no chat history exists"""
     try:
-        with open(config.chatlog_path, "r", encoding='utf-8') as file:
-            content = file.read()
-            if len(content) < 5:
-                with open(TempDirectoryPath('Database.data'), 'w', encoding='utf-8') as f:
-                    f.write("")
-                with open(TempDirectoryPath('Responses.data'), 'w', encoding='utf-8') as f:
-                    f.write(config.default_message)
-                print("📋 Default chat message loaded")
+        if len(get_chat_log()) == 0:
+            ShowTextToScreen(config.default_message)
+            print("📋 Default chat message loaded")
     except Exception as e:
         print(f"❌ Error in ShowDefaultChatIfNoChats: {e}")
 
-def ReadChatLogJson():
-    """Read chat log from JSON file"""
-    try:
-        with open(config.chatlog_path, 'r', encoding='utf-8') as file:
-            chatlog_data = json.load(file)
-        return chatlog_data
-    except json.JSONDecodeError:
-        print("⚠️  ChatLog.json is corrupted. Creating new one...")
-        with open(config.chatlog_path, 'w', encoding='utf-8') as file:
-            json.dump([], file)
-        return []
-    except Exception as e:
-        print(f"❌ Error reading ChatLog: {e}")
-        return []
+def FormatChatLog(messages):
+    """Chat log messages as the "Name: text" lines shown in the GUI"""
+    names = {"user": config.username, "assistant": config.assistantname}
+    lines = [f"{names[entry.get('role')]}: {entry.get('content', '')}"
+             for entry in messages if entry.get("role") in names]
+    return AnswerModifier("\n".join(lines))
 
-def ChatLogIntegration():
-    """Integrate chat log into GUI display"""
+def LoadOlderChats():
+    """Previous page of history for the GUI, one formatted entry per message"""
     try:
-        json_data = ReadChatLogJson()
-        formatted_chatlog = ""
-        
-        for entry in json_data:
-            if entry.get("role") == "user":
-                formatted_chatlog += f"User: {entry.get('content', '')}\n"
-            elif entry.get("role") == "assistant":
-                formatted_chatlog += f"Assistant: {entry.get('content', '')}\n"
-        
-        formatted_chatlog = formatted_chatlog.replace("User", config.username)
-        formatted_chatlog = formatted_chatlog.replace("Assistant", config.assistantname)
-        
-        with open(TempDirectoryPath('Database.data'), 'w', encoding='utf-8') as file:
-            file.write(AnswerModifier(formatted_chatlog))
-        
-        print("💬 Chat log integrated")
+        return [FormatChatLog([message]) for message in chat_history.older()]
     except Exception as e:
-        print(f"❌ Error in ChatLogIntegration: {e}")
+        print(f"❌ Error loading older chats: {e}")
+        return []
 
 def ShowChatsOnGUI():
-    """Display chat history on GUI"""
+    """Let the GUI page in chat history, starting with the most recent messages"""
     try:
-        with open(TempDirectoryPath('Database.data'), "r", encoding='utf-8') as file:
-            data = file.read()
-        
-        if len(str(data)) > 0:
-            lines = data.split('\n')
-            result = '\n'.join(lines)
-            
-            with open(TempDirectoryPath('Responses.data'), "w", encoding='utf-8') as file:
-                file.write(result)
-        
+        SetHistorySource(LoadOlderChats, chat_history.forget)
         print("🖥️  Chat display updated")
     except Exception as e:
         print(f"❌ Error in ShowChatsOnGUI: {e}")
@@ -178,12 +146,12 @@ def InitialExecution():
         # Setup default chat
         ShowDefaultChatIfNoChats()
         
-        # Integrate chat log
-        ChatLogIntegration()
-        
         # Display chats on GUI
         ShowChatsOnGUI()
         
+        # Load the backends in the background once the window had time to show
+        services.preload("model", "chatbot", "search", "automation", "tts", delay=1.0)
+        
         print("✅ Initialization complete!")
         print("\n" + "="*60)
         print("💡 Click the microphone button to start speaking")
@@ -196,105 +164,26 @@ def InitialExecution():
 # ==================== MAIN EXECUTION FUNCTIONS ====================
 
 def MainExecution():
-    """Main execution loop for processing user queries"""
+    """Listen for one query and run it through the turn pipeline"""
     try:
-        TaskExecution = False
-        ImageExecution = False
-        ImageGenerationQuery = ""
-        
         # Listen for user input
         SetAssistantStatus("Listening...")
         Query = SpeechRecognition()
         
-        if not Query or Query.strip() == "":
+        if Query is None:
+            # offline input (file: / stdin) is exhausted; stop listening instead of looping
+            SetMicrophoneStatus("False")
+            return False
+        if Query.strip() == "":
             return False
             
         ShowTextToScreen(f"{config.username} : {Query}")
         
-        # Process query through AI decision model
-        SetAssistantStatus("Thinking...")
-        Decision = FirstLayerDMM(Query)
-        
-        print(f"\n💭 Decision: {Decision}\n")
-        
-        # Analyze decision types
-        G = any([i for i in Decision if i.startswith("general")])
-        R = any([i for i in Decision if i.startswith("realtime")])
-        
-        Merged_query = " and ".join(
-            [" ".join(i.split()[1:]) for i in Decision if i.startswith("general") or i.startswith("realtime")]
-        )
-        
-        print(f"🎯 Query: {Merged_query}\n")
-        
-        # Check for image generation
-        for query in Decision:
-            if "generate " in query:
-                ImageGenerationQuery = str(query)
-                ImageExecution = True
-        
-        # Check for automation tasks
-        for query in Decision:
-            if not TaskExecution:
-                if any(query.startswith(func) for func in config.functions):
-                    run(Automation(list(Decision)))
-                    TaskExecution = True
-        
-        # Handle image generation
-        if ImageExecution:
-            try:
-                image_data_path = os.path.join("Frontend", "Files", "ImageGeneration.data")
-                with open(image_data_path, "w") as file:
-                    file.write(f"{ImageGenerationQuery},True")
-                
-                image_gen_path = os.path.join(config.base_dir, 'Backend', 'ImageGenration.py')
-                p1 = subprocess.Popen(['python3', image_gen_path],
-                                     stdout=subprocess.PIPE, 
-                                     stderr=subprocess.PIPE,
-                                     stdin=subprocess.PIPE, 
-                                     shell=False)
-                config.subprocesses.append(p1)
-                print("🎨 Image generation started")
-            except Exception as e:
-                print(f"❌ Error starting ImageGeneration: {e}")
-        
-        # Handle realtime search
-        if (G and R) or R:
-            SetAssistantStatus("Searching...")
-            Answer = RealtimeSearchEngine(QueryModifier(Merged_query))
-            ShowTextToScreen(f"{config.assistantname} : {Answer}")
-            SetAssistantStatus("Answering...")
-            TextToSpeech(Answer)
-            return True
-        
-        # Handle general queries
-        else:
-            for query in Decision:
-                if "general" in query:
-                    SetAssistantStatus("Thinking...")
-                    QueryFinal = query.replace("general ", "")
-                    Answer = ChatBot(QueryModifier(QueryFinal))
-                    ShowTextToScreen(f"{config.assistantname} : {Answer}")
-                    SetAssistantStatus("Answering...")
-                    TextToSpeech(Answer)
-                    return True
-                    
-                elif "realtime" in query:
-                    SetAssistantStatus("Searching...")
-                    QueryFinal = query.replace("realtime ", "")
-                    Answer = RealtimeSearchEngine(QueryModifier(QueryFinal))
-                    ShowTextToScreen(f"{config.assistantname} : {Answer}")
-                    SetAssistantStatus("Answering...")
-                    TextToSpeech(Answer)
-                    return True
-                    
-                elif "exit" in query:
-                    QueryFinal = "Okay, Bye!"
-                    Answer = ChatBot(QueryModifier(QueryFinal))
-                    ShowTextToScreen(f"{config.assistantname} : {Answer}")
-                    SetAssistantStatus("Answering...")
-                    TextToSpeech(Answer)
-                    cleanup_and_exit()
+        # Decision, automation, image generation and the answer overlap inside the pipeline
+        result = turn_pipeline.run_sync(Query)
+        if result.exit:
+            cleanup_and_exit()
+        return True
                     
     except Exception as e:
         print(f"❌ Error in MainExecution: {e}")
@@ -315,7 +204,8 @@ def FirstThread():
                 AIStatus = GetAssistantStatus()
                 if "Available ..." not in AIStatus:
                     SetAssistantStatus("Available ...")
-                sleep(0.1)
+                # Block until the mic button is pressed instead of polling
+                WaitForMicrophoneStatus("True")
         except Exception as e:
             print(f"❌ Error in backend thread: {e}")
             sleep(1)
@@ -335,13 +225,20 @@ def cleanup_and_exit(signum=None, frame=None):
     """Clean up resources and exit"""
     print("\n\n🛑 Shutting down AXIS AI...")
     
-    # Terminate subprocesses
-    for process in config.subprocesses:
-        try:
-            process.terminate()
-            process.wait(timeout=2)
-        except:
-            process.kill()
+    # Stop the speech recognition browser if it was started
+    try:
+        GetRecognitionWorker().close()
+    except Exception as e:
+        print(f"❌ Error stopping speech recognition: {e}")
+    
+    turn_pipeline.close()
+    
+    # Release the audio mixer kept open between utterances
+    try:
+        if services.loaded("tts"):
+            services.tts.pipeline.close()
+    except Exception as e:
+        print(f"❌ Error closing audio: {e}")
     
     print("✅ Cleanup complete. Goodbye!")
     sys.exit(0)
@@ -7,16 +7,15 @@ import streamlit as st
 import os
 import json
 import time
+import uuid
 from datetime import datetime
-from dotenv import dotenv_values
 from asyncio import run
 
-# Backend imports
-from Backend.Model import FirstLayerDMM
-from Backend.RealtimeSearchEngine import RealtimeSearchEngine
-from Backend.Automation import Automation
-from Backend.Chatbot import ChatBot
-from Backend.TextToSpeech import TextToSpeech
+# Backend imports (the model, search, chat, automation and image backends
+# load through the service locator on the first query)
+from Backend.Services import services
+from Backend.Config import get_config
+from Backend.Sessions import sessions, session_token, session_from_token
 
 # Try to import speech recognition - fallback to text input if not available
 try:
@@ -26,10 +25,11 @@ except ImportError:
     SPEECH_AVAILABLE = False
 
 # Configuration
-env_vars = dotenv_values(".env")
-USERNAME = env_vars.get("Username", "User")
-ASSISTANTNAME = env_vars.get("Assistantname", "Axis")
-FUNCTIONS = ["open", "close", "play", "system", "content", "google search", "youtube search"]
+config = get_config()
+USERNAME = config.username
+ASSISTANTNAME = config.get("Assistantname", "Axis")
+# Messages rendered per rerun; older ones are read from the log on demand
+CHAT_PAGE_SIZE = config.int("ChatPageSize", 50)
 
 # Page configuration
 st.set_page_config(
@@ -113,32 +113,33 @@ if 'assistant_status' not in st.session_state:
     st.session_state.assistant_status = "Available..."
 if 'processing' not in st.session_state:
     st.session_state.processing = False
+if 'visible_count' not in st.session_state:
+    st.session_state.visible_count = CHAT_PAGE_SIZE
+if 'session_id' not in st.session_state:
+    # a signed token in the URL brings the same history back after a reload;
+    # edited or made-up tokens are ignored, so other sessions cannot be opened
+    session_id = session_from_token(st.query_params.get("session"))
+    if session_id is None:
+        session_id = uuid.uuid4().hex
+        st.query_params["session"] = session_token(session_id)
+    st.session_state.session_id = session_id
 
-# Cross-platform path helper
-def get_data_dir():
-    """Get the Data directory path, creating it if needed"""
-    data_dir = os.path.join(os.getcwd(), 'Data')
-    os.makedirs(data_dir, exist_ok=True)
-    return data_dir
+# Every browser session reads and writes only its own conversation
+conversation = sessions.get(st.session_state.session_id)
 
-# Load chat history from JSON
-def load_chat_log():
-    chatlog_path = os.path.join(get_data_dir(), 'ChatLog.json')
-    if os.path.exists(chatlog_path):
-        try:
-            with open(chatlog_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            st.warning(f"Error loading chat log: {e}")
-            return []
-    return []
+# Load the most recent messages from this session's chat log
+def load_chat_log(count=CHAT_PAGE_SIZE):
+    try:
+        return conversation.log.tail(count)
+    except Exception as e:
+        st.warning(f"Error loading chat log: {e}")
+        return []
 
-# Save chat history to JSON
-def save_chat_log(messages):
-    chatlog_path = os.path.join(get_data_dir(), 'ChatLog.json')
+# Append messages that no backend has persisted yet (ChatBot and
+# RealtimeSearchEngine write their own turns to the session's log)
+def append_chat_log(*messages):
     try:
-        with open(chatlog_path, 'w', encoding='utf-8') as f:
-            json.dump(messages, f, indent=4, ensure_ascii=False)
+        conversation.log.extend(messages)
     except Exception as e:
         st.error(f"Error saving chat log: {e}")
 
@@ -154,7 +155,21 @@ if not st.session_state.chat_history:
             "content": f"Welcome {USERNAME}! I am {ASSISTANTNAME}, your advanced AI assistant. How may I help you?"
         }
         st.session_state.chat_history = [welcome_msg]
-        save_chat_log(st.session_state.chat_history)
+        append_chat_log(welcome_msg)
+
+def message_markdown(role, content):
+    name = USERNAME if role == "user" else ASSISTANTNAME
+    return f"**{name}:** {content}"
+
+def render_message(message):
+    role = "user" if message.get("role") == "user" else "assistant"
+    with st.chat_message(role):
+        st.markdown(message_markdown(role, message.get("content", "")))
+
+def load_older_messages():
+    """Show one more page of history, read from the end of the log."""
+    st.session_state.visible_count += CHAT_PAGE_SIZE
+    st.session_state.chat_history = load_chat_log(st.session_state.visible_count)
 
 # Helper functions
 def AnswerModifier(answer):
@@ -209,22 +224,39 @@ def recognize_speech_from_audio(audio_file):
         st.error(f"Speech recognition error: {e}")
         return None
 
+# Render an answer into the chat area as Gemini streams it
+def stream_answer(container, chunks):
+    """Show chunks in an assistant bubble as they arrive; returns the full answer."""
+    prefix = f"**{ASSISTANTNAME}:** "
+
+    def prefixed():
+        yield prefix
+        yield from chunks
+
+    with container:
+        with st.chat_message("assistant"):
+            answer = st.write_stream(prefixed())
+    return answer[len(prefix):]
+
 # Main execution function
-def process_query(query):
-    """Process user query through AI pipeline"""
+def process_query(query, container=None):
+    """Process user query through AI pipeline, streaming the answer into container"""
     if not query or query.strip() == "":
         return None
     
     st.session_state.processing = True
     st.session_state.assistant_status = "Thinking..."
+    container = container or st.container()
     
     # Add user message to chat
-    st.session_state.chat_history.append({"role": "user", "content": query})
-    save_chat_log(st.session_state.chat_history)
+    user_msg = {"role": "user", "content": query}
+    st.session_state.chat_history.append(user_msg)
+    with container:
+        render_message(user_msg)
     
     try:
         # Get decision from DMM
-        Decision = FirstLayerDMM(query)
+        Decision = services.model.FirstLayerDMM(query)
         
         # Analyze decision types
         G = any([i for i in Decision if i.startswith("general")])
@@ -234,7 +266,6 @@ def process_query(query):
             [" ".join(i.split()[1:]) for i in Decision if i.startswith("general") or i.startswith("realtime")]
         )
         
-        TaskExecution = False
         ImageExecution = False
         ImageGenerationQuery = ""
         
@@ -244,30 +275,34 @@ def process_query(query):
                 ImageGenerationQuery = str(q)
                 ImageExecution = True
         
-        # Check for automation tasks
-        for q in Decision:
-            if not TaskExecution:
-                if any(q.startswith(func) for func in FUNCTIONS):
-                    try:
-                        run(Automation(list(Decision)))
-                        TaskExecution = True
-                    except Exception as e:
-                        st.warning(f"Automation task failed: {e}")
+        # Run automation tasks (routed through the command registry)
+        registry = services.automation.registry
+        commands = [q for q in Decision if registry.is_command(q)]
+        if commands:
+            try:
+                run(services.automation.Automation(commands))
+            except Exception as e:
+                st.warning(f"Automation task failed: {e}")
         
-        # Handle image generation
+        # Handle image generation; results are shown straight from memory
         if ImageExecution:
-            st.info(f"🎨 Image generation requested: {ImageGenerationQuery}")
-            # Note: Image generation would need to be handled separately in Streamlit
+            job = services.images.image_service.submit(ImageGenerationQuery, show=False)
+            with container:
+                with st.spinner(f"🎨 Generating images: {ImageGenerationQuery}"):
+                    job.wait(timeout=180)
+                if job.images:
+                    st.image([image.data for image in job.images], width=256)
+                else:
+                    st.warning(f"Image generation {job.status}: {job.error or 'timed out'}")
         
         # Handle realtime search
         if (G and R) or R:
             st.session_state.assistant_status = "Searching..."
-            answer = RealtimeSearchEngine(QueryModifier(Merged_query))
+            answer = stream_answer(container, services.search.RealtimeSearchEngineStream(QueryModifier(Merged_query), conversation=conversation))
             st.session_state.assistant_status = "Answering..."
             
             # Add assistant response
             st.session_state.chat_history.append({"role": "assistant", "content": answer})
-            save_chat_log(st.session_state.chat_history)
             
             return answer
         
@@ -277,37 +312,40 @@ def process_query(query):
                 if "general" in q:
                     st.session_state.assistant_status = "Thinking..."
                     QueryFinal = q.replace("general ", "")
-                    answer = ChatBot(QueryModifier(QueryFinal))
+                    answer = stream_answer(container, services.chatbot.ChatBotStream(QueryModifier(QueryFinal), conversation=conversation))
                     st.session_state.assistant_status = "Answering..."
                     
                     # Add assistant response
                     st.session_state.chat_history.append({"role": "assistant", "content": answer})
-                    save_chat_log(st.session_state.chat_history)
                     
                     return answer
                     
                 elif "realtime" in q:
                     st.session_state.assistant_status = "Searching..."
                     QueryFinal = q.replace("realtime ", "")
-                    answer = RealtimeSearchEngine(QueryModifier(QueryFinal))
+                    answer = stream_answer(container, services.search.RealtimeSearchEngineStream(QueryModifier(QueryFinal), conversation=conversation))
                     st.session_state.assistant_status = "Answering..."
                     
                     # Add assistant response
                     st.session_state.chat_history.append({"role": "assistant", "content": answer})
-                    save_chat_log(st.session_state.chat_history)
                     
                     return answer
                     
                 elif "exit" in q:
                     answer = "Goodbye! Have a great day!"
-                    st.session_state.chat_history.append({"role": "assistant", "content": answer})
-                    save_chat_log(st.session_state.chat_history)
+                    assistant_msg = {"role": "assistant", "content": answer}
+                    st.session_state.chat_history.append(assistant_msg)
+                    append_chat_log(user_msg, assistant_msg)
                     return answer
         
+        # Automation-only turn: nothing was persisted by a backend
+        append_chat_log(user_msg)
+        
     except Exception as e:
         error_msg = f"I apologize, but I encountered an error: {str(e)}"
-        st.session_state.chat_history.append({"role": "assistant", "content": error_msg})
-        save_chat_log(st.session_state.chat_history)
+        assistant_msg = {"role": "assistant", "content": error_msg}
+        st.session_state.chat_history.append(assistant_msg)
+        append_chat_log(user_msg, assistant_msg)
         return error_msg
     finally:
         st.session_state.processing = False
@@ -338,18 +376,19 @@ def main():
     
     # Chat display area with scrollable container
     st.markdown("### 💬 Chat History")
+    # Only the last visible_count messages are kept and rendered, so a rerun
+    # costs the same however long the conversation gets
     chat_container = st.container(height=500)
+    history = st.session_state.chat_history
+    if len(history) > st.session_state.visible_count:
+        del history[:len(history) - st.session_state.visible_count]
     with chat_container:
-        for idx, message in enumerate(st.session_state.chat_history):
-            role = message.get("role", "assistant")
-            content = message.get("content", "")
-            
-            if role == "user":
-                with st.chat_message("user"):
-                    st.write(f"**{USERNAME}:** {content}")
-            else:
-                with st.chat_message("assistant"):
-                    st.write(f"**{ASSISTANTNAME}:** {content}")
+        older = len(conversation.log) - len(history)
+        if older > 0 and st.button(f"⬆️ Load older messages ({older} more)", key="load_older"):
+            load_older_messages()
+            st.rerun()
+        for message in history:
+            render_message(message)
     
     st.divider()
     
@@ -393,7 +432,7 @@ def main():
         with col_btn1:
             send_button = st.button("📤 Send", type="primary", disabled=st.session_state.processing or not user_input)
             if send_button and user_input:
-                process_query(user_input)
+                process_query(user_input, chat_container)
                 st.rerun()
         
         with col_btn2:
@@ -403,7 +442,8 @@ def main():
         with col_btn3:
             if st.button("🗑️ Clear Chat"):
                 st.session_state.chat_history = []
-                save_chat_log([])
+                st.session_state.visible_count = CHAT_PAGE_SIZE
+                conversation.log.clear()
                 st.rerun()
     
     # Sidebar for settings
@@ -415,10 +455,10 @@ def main():
         st.write(mic_status_text)
         
         st.subheader("Chat History")
-        st.write(f"{len(st.session_state.chat_history)} messages")
+        st.write(f"{len(conversation.log)} messages")
         
         if st.button("📥 Export Chat"):
-            chat_json = json.dumps(st.session_state.chat_history, indent=2)
+            chat_json = json.dumps(conversation.log.read_all(), indent=2)
             st.download_button(
                 label="Download Chat History",
                 data=chat_json,
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Concurrency stress test for Backend.RealtimeSearchEngine.
+
+    python search_stress_test.py             # 64 requests per round
+    python search_stress_test.py --calls 400
+
+Half of the requests run on threads and half as asyncio tasks, first each
+into its own conversation and then all into one shared conversation. A fake
+model echoes the search results and question it was given, so any request
+that saw another's state shows up as a wrong answer. No network or API key
+is needed. Exits with status 1 if a request or a chat log was mixed up.
+"""
+
+import re
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from Backend.Sessions import ConversationStore
+from Backend.RealtimeSearchEngine import RealtimeSearchRequest
+
+
+class EchoModel:
+    """Fake Gemini that answers with the search token and question token it was given."""
+
+    class _Chunk:
+        def __init__(self, text):
+            self.text = text
+
+    def generate_content(self, prompt, generation_config=None, stream=False):
+        searched = re.findall(r"\[results:(\w+)\]", prompt)
+        asked = prompt.rsplit("User: ", 1)[-1].split()[-1]
+        for text in ("answer ", ",".join(searched), " for ", asked):
+            time.sleep(0.001)  # give other requests a chance to interleave
+            yield self._Chunk(text)
+
+
+def StressTest(calls=64):
+    """Failures ([(who, answer)]) and elapsed seconds for 2 * calls requests."""
+    model = EchoModel()
+    store = ConversationStore(tempfile.mkdtemp(prefix="rse-stress-"), max_active=calls + 1)
+    shared = store.get("shared")
+
+    def run(i, conversation):
+        token = f"t{i}"
+        request = RealtimeSearchRequest(f"question {token}", f"[results:{token}]", conversation, model)
+        return token, "".join(request.stream())
+
+    def threaded(conversation_for):
+        with ThreadPoolExecutor(max_workers=calls) as pool:
+            return list(pool.map(lambda i: run(i, conversation_for(i)), range(0, calls, 2)))
+
+    async def tasks(conversation_for):
+        return await asyncio.gather(*[asyncio.to_thread(run, i, conversation_for(i)) for i in range(1, calls, 2)])
+
+    started = time.perf_counter()
+    failures = []
+    for conversation_for in (lambda i: store.get(f"user{i}"), lambda i: shared):
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            threads = pool.submit(threaded, conversation_for)
+            results = asyncio.run(tasks(conversation_for)) + threads.result()
+        failures += [(token, answer) for token, answer in results if answer != f"answer {token} for {token}"]
+    elapsed = time.perf_counter() - started
+
+    # every turn kept its question and answer together, in both kinds of log
+    for conversation in [store.get(f"user{i}") for i in range(calls)] + [shared]:
+        log = conversation.log.read_all()
+        for question, answer in zip(log[::2], log[1::2]):
+            token = question["content"].split()[-1]
+            if answer["content"] != f"answer {token} for {token}":
+                failures.append((conversation.session_id, answer["content"]))
+    if len(shared.log) != 2 * calls:
+        failures.append(("shared", f"{len(shared.log)} messages, expected {2 * calls}"))
+    store.close()
+    return failures, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--calls", type=int, default=64, help="concurrent requests per round")
+    args = parser.parse_args()
+    failures, elapsed = StressTest(args.calls)
+    if failures:
+        print(f"{len(failures)} mixed-up requests, first ones: {failures[:5]}")
+        sys.exit(1)
+    print(f"{2 * args.calls} concurrent requests isolated in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
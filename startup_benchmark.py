@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the entry points, based on python -X importtime.
+
+    python startup_benchmark.py              # Start.py, Main.py and app.py
+    python startup_benchmark.py Start --top 20 --budget 1.0
+
+Each module is imported in a fresh interpreter (its __main__ block does not
+run). The report shows the wall time of the import, the slowest top-level
+packages and any heavy backend dependency that was imported eagerly; those
+should only load through Backend.Services on first use. Exits with status 1
+if a module goes over the budget or imports a deferred dependency.
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+import subprocess
+
+ENTRY_POINTS = ["Start", "Main", "app"]
+
+# Only ever imported lazily, the GUI does not need them to show
+DEFERRED = ["google.generativeai", "cohere", "selenium", "webdriver_manager", "pygame", "edge_tts",
+            "pywhatkit", "keyboard", "bs4", "googlesearch", "PIL", "speech_recognition"]
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def MeasureImport(module):
+    """(wall seconds, [(cumulative us, depth, name)], stderr) for importing module."""
+    code = f"import {module}"
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True,
+                          cwd=os.path.dirname(os.path.abspath(__file__)))
+    wall = time.perf_counter() - start
+    entries = []
+    for line in proc.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            entries.append((int(match.group(2)), len(match.group(3)) // 2, match.group(4)))
+    errors = "\n".join(line for line in proc.stderr.splitlines() if not line.startswith("import time:"))
+    return wall, entries, errors if proc.returncode else ""
+
+
+def Report(module, top, budget):
+    wall, entries, errors = MeasureImport(module)
+    print(f"== {module}: {wall * 1000:.0f} ms wall (interpreter start included)")
+    if errors:
+        print(f"   import failed:\n{errors}")
+        return False
+    # depth 0 is what the interpreter imported itself, depth 1 what the module pulled in
+    for cumulative, depth, name in sorted((e for e in entries if e[1] <= 1), reverse=True)[:top]:
+        print(f"   {cumulative / 1000:8.1f} ms  {name}")
+    imported = {name for _, _, name in entries}
+    eager = [name for name in DEFERRED if name in imported]
+    if eager:
+        print(f"   eagerly imported: {', '.join(eager)}")
+    within = wall <= budget
+    if not within:
+        print(f"   over budget ({budget * 1000:.0f} ms)")
+    return within and not eager
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS)
+    parser.add_argument("--top", type=int, default=10, help="slowest packages to list")
+    parser.add_argument("--budget", type=float, default=1.0, help="seconds allowed per import")
+    args = parser.parse_args()
+    ok = all([Report(module, args.top, args.budget) for module in args.modules])
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()